@@ -1,9 +1,80 @@
 #!/usr/bin/env python3
 """Analyze the output to understand what happened with SVG conversion."""
 
+import mmap
 import re
+import sys
 from pathlib import Path
 
+# Patterns run over the raw UTF-8 bytes of a memory-mapped file
+SVG_MENTION_RE = re.compile(rb'svg|flowchart|placeholder', re.IGNORECASE)
+PLACEHOLDER_RE = re.compile(rb'SVG_PLACEHOLDER_\d+')
+BOX_CHAR_RE = re.compile('┌|└|│|─'.encode('utf-8'))
+# Any byte bytes.strip() would keep
+NON_WHITESPACE_RE = re.compile(rb'[^ \t\n\r\x0b\x0c]')
+
+def iter_fence_lines(content):
+    """Yield (start, end) offsets of every bare ``` line using bytes.find."""
+    pos = 0
+    size = len(content)
+    while True:
+        i = content.find(b'```', pos)
+        if i < 0:
+            return
+        line_start = content.rfind(b'\n', 0, i) + 1
+        line_end = content.find(b'\n', i)
+        if line_end < 0:
+            line_end = size
+        if content[line_start:line_end].strip() == b'```':
+            yield line_start, line_end
+        pos = line_end + 1
+
+def report_content(content, out):
+    """Append code block and SVG statistics for a bytes-like markdown buffer to out."""
+    # Lines are split on \n only, so \r\n and lone \r breaks are first translated
+    # the way text-mode reads did; files without \r are still scanned in place
+    if content.find(b'\r') >= 0:
+        content = bytes(content).replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+    # Count empty code blocks
+    empty_blocks = 0
+    total_blocks = 0
+    line_no = 0
+    counted_to = 0
+    opening = None
+    for line_start, line_end in iter_fence_lines(content):
+        if opening is None:
+            # Starting a code block
+            opening = (line_start, line_end)
+            continue
+        # Ending a code block; one left open at the end of the file isn't counted
+        open_start, open_end = opening
+        opening = None
+        total_blocks += 1
+        # Stops at the first visible byte without copying the block body
+        if not NON_WHITESPACE_RE.search(content, open_end + 1, line_start):  # All lines were empty
+            empty_blocks += 1
+            line_no += content[counted_to:open_start].count(b'\n')
+            counted_to = open_start
+            out.append(f"  Empty code block found at line {line_no}\n")
+    
+    out.append(f"  Total code blocks: {total_blocks}\n")
+    out.append(f"  Empty code blocks: {empty_blocks}\n")
+    out.append(f"  File length: {len(content)} bytes\n")
+    
+    # Check for SVG-related content
+    svg_mentions = len(SVG_MENTION_RE.findall(content))
+    out.append(f"  SVG/flowchart/placeholder mentions: {svg_mentions}\n")
+    
+    # Look for any remaining placeholders
+    placeholders = [p.decode('ascii') for p in PLACEHOLDER_RE.findall(content)]
+    if placeholders:
+        out.append(f"  Found unreplaced placeholders: {placeholders}\n")
+    
+    # Check for ASCII art patterns
+    ascii_boxes = len(BOX_CHAR_RE.findall(content))
+    if ascii_boxes > 0:
+        out.append(f"  ASCII box characters found: {ascii_boxes}\n")
+
 def analyze_output():
     """Analyze the generated markdown files."""
     
@@ -13,53 +84,20 @@ def analyze_output():
         print("No output directory found!")
         return
     
+    # Collect the report and write it once instead of one print per line
+    out = []
     for md_file in output_dir.glob('*.md'):
-        print(f"\n=== Analyzing {md_file.name} ===")
-        
-        with open(md_file, 'r', encoding='utf-8') as f:
-            content = f.read()
+        out.append(f"\n=== Analyzing {md_file.name} ===\n")
         
-        # Count empty code blocks
-        empty_blocks = 0
-        total_blocks = 0
-        lines = content.split('\n')
-        
-        in_code_block = False
-        code_block_content = []
-        
-        for i, line in enumerate(lines):
-            if line.strip() == '```':
-                if not in_code_block:
-                    # Starting a code block
-                    in_code_block = True
-                    total_blocks += 1
-                    code_block_content = []
-                else:
-                    # Ending a code block
-                    in_code_block = False
-                    if not any(code_block_content):  # All lines were empty
-                        empty_blocks += 1
-                        print(f"  Empty code block found at line {i - len(code_block_content) - 1}")
-            elif in_code_block:
-                code_block_content.append(line.strip())
-        
-        print(f"  Total code blocks: {total_blocks}")
-        print(f"  Empty code blocks: {empty_blocks}")
-        print(f"  File length: {len(content)} chars")
-        
-        # Check for SVG-related content
-        svg_mentions = len(re.findall(r'svg|SVG|flowchart|placeholder', content, re.IGNORECASE))
-        print(f"  SVG/flowchart/placeholder mentions: {svg_mentions}")
-        
-        # Look for any remaining placeholders
-        placeholders = re.findall(r'SVG_PLACEHOLDER_\d+', content)
-        if placeholders:
-            print(f"  Found unreplaced placeholders: {placeholders}")
-        
-        # Check for ASCII art patterns
-        ascii_boxes = len(re.findall(r'[┌└│─]', content))
-        if ascii_boxes > 0:
-            print(f"  ASCII box characters found: {ascii_boxes}")
+        with open(md_file, 'rb') as f:
+            # mmap refuses to map zero-length files
+            if md_file.stat().st_size == 0:
+                report_content(b'', out)
+                continue
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                report_content(mm, out)
+    
+    sys.stdout.write(''.join(out))
 
 if __name__ == "__main__":
     analyze_output()
\ No newline at end of file
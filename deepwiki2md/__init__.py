@@ -6,7 +6,7 @@ to Markdown format using PyDoll for reliable browser automation.
 """
 
 from .converter import MarkdownConverter
-from .utils import DeepWikiURL
+from .utils import DeepWikiURL, parse_deepwiki_url
 
 # Try to use PyDoll scraper with Chrome browser automation
 try:
@@ -19,4 +19,4 @@ except ImportError:
     _USE_PYDOLL = False
 
 __version__ = "1.0.0"
-__all__ = ["DeepWikiScraper", "MarkdownConverter", "DeepWikiURL", "_USE_PYDOLL"]
\ No newline at end of file
+__all__ = ["DeepWikiScraper", "MarkdownConverter", "DeepWikiURL", "parse_deepwiki_url", "_USE_PYDOLL"]
\ No newline at end of file
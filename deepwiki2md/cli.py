@@ -7,8 +7,8 @@ import sys
 from pathlib import Path
 from typing import List
 
-from .scraper import DeepWikiScraper
-from .utils import DeepWikiURL
+from . import DeepWikiScraper
+from .utils import parse_deepwiki_url
 
 
 def setup_logging(verbose: bool = False) -> None:
@@ -35,13 +35,26 @@ async def scrape_command(args) -> None:
     scraper = DeepWikiScraper(
         output_dir=args.output_dir,
         headless=not args.show_browser,
-        converter_kwargs=converter_kwargs
+        converter_kwargs=converter_kwargs,
+        max_concurrency=args.max_concurrency,
+        cache_dir=args.cache_dir,
+        cache_ttl=args.cache_ttl,
+        prefer_static=args.prefer_static,
+        convert_processes=args.convert_processes,
+        block_resources=not args.load_resources
     )
     
+    # One browser serves every library in this run
+    async with scraper:
+        await _run_scrape(scraper, args)
+
+
+async def _run_scrape(scraper: DeepWikiScraper, args) -> None:
+    """Scrape the requested libraries with an open scraper."""
     if len(args.urls) == 1:
         # Single library
         url = args.urls[0]
-        deepwiki_url = DeepWikiURL(url)
+        deepwiki_url = parse_deepwiki_url(url)
         
         if not deepwiki_url.is_valid_deepwiki():
             print(f"Error: Invalid DeepWiki URL: {url}")
@@ -101,6 +114,39 @@ Examples:
         action='store_true',
         help='Show browser window (default: headless)'
     )
+    scrape_parser.add_argument(
+        '--max-concurrency',
+        type=int,
+        default=3,
+        help='Maximum number of pages fetched in parallel (default: 3)'
+    )
+    scrape_parser.add_argument(
+        '--cache-dir',
+        help='Cache rendered page HTML in this directory and reuse it on later runs'
+    )
+    scrape_parser.add_argument(
+        '--cache-ttl',
+        type=float,
+        default=24 * 60 * 60,
+        help='Seconds a cached page stays valid (default: 86400)'
+    )
+    scrape_parser.add_argument(
+        '--convert-processes',
+        type=int,
+        default=0,
+        help='Worker processes for markdown conversion (default: 0, convert in-process)'
+    )
+    scrape_parser.add_argument(
+        '--load-resources',
+        action='store_true',
+        help='Let the browser load images, fonts and media (default: blocked)'
+    )
+    scrape_parser.add_argument(
+        '--prefer-static',
+        action='store_true',
+        help='Try a plain HTTP fetch first and only render pages that need it '
+             '(faster, but may miss content rendered by JavaScript)'
+    )
     scrape_parser.add_argument(
         '--svg-api-base-url',
         help='OpenAI-compatible API base URL for SVG flowchart conversion (e.g., http://localhost:1234/v1)'
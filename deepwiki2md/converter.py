@@ -1,21 +1,51 @@
 """Markdown conversion functionality for deepwiki2md."""
 
+import copy
+import hashlib
 import logging
-from typing import Optional, Dict, Any
-from bs4 import BeautifulSoup
-from markdownify import markdownify
+import re
+from typing import Optional, Dict, Any, List, Tuple, Union
+import soupsieve
+from bs4 import BeautifulSoup, CData, NavigableString, Tag
+from markdownify import MarkdownConverter as MarkdownifyConverter
 
-from .utils import ContentCleaner
+from .utils import ContentCleaner, PageCache, HTML_PARSER, json_dumps, json_loads
 from .svg_converter import SVGToD2Converter
 
 logger = logging.getLogger(__name__)
 
+# Selectors for the main content container, ordered by specificity
+_CONTENT_SELECTORS = (
+    'main article',
+    'main .content',
+    'main',
+    'article',
+    '.content',
+    '.article-content',
+    '#content',
+    '.markdown-body',
+    '.documentation-content',
+    '.page-content',
+    '[role="main"]',
+)
+# All content selectors in one compiled pattern, so candidates are found in a
+# single tree walk; the per-selector patterns then rank them by specificity
+_CONTENT_SELECTOR = soupsieve.compile(', '.join(_CONTENT_SELECTORS))
+_CONTENT_SELECTOR_PATTERNS = tuple(
+    (selector, soupsieve.compile(selector)) for selector in _CONTENT_SELECTORS
+)
+
+# Trailing whitespace on each line, and runs of two or more empty lines
+_TRAILING_WHITESPACE_RE = re.compile(r'[^\S\n]+$', re.MULTILINE)
+_EXCESS_NEWLINES_RE = re.compile(r'\n{3,}')
+
 
 class MarkdownConverter:
     """Converts HTML content to clean Markdown format."""
     
     def __init__(self, heading_style: str = "ATX", strip_navigation: bool = True, 
-                 svg_api_base_url: str = None, svg_api_key: str = None, svg_model: str = "gpt-4o-mini"):
+                 svg_api_base_url: str = None, svg_api_key: str = None, svg_model: str = "gpt-4o-mini",
+                 cache_dir: Optional[str] = None):
         """
         Initialize the converter.
         
@@ -25,27 +55,41 @@ class MarkdownConverter:
             svg_api_base_url: OpenAI-compatible API base URL for SVG conversion
             svg_api_key: API key for SVG conversion
             svg_model: Model name for SVG conversion
+            cache_dir: Directory for caching conversion results by page content and converted
+                SVG diagrams (disabled if None)
         """
         self.heading_style = heading_style
         self.strip_navigation = strip_navigation
+        self.svg_model = svg_model
+        
+        # Results are keyed by the HTML itself, so they never go stale
+        self.result_cache = PageCache(cache_dir, ttl=None) if cache_dir else None
+        
+        # One markdownify converter per instance keeps its option setup and
+        # tag-handler lookup cache warm across pages
+        self._markdownify = MarkdownifyConverter(
+            heading_style=heading_style,
+            strip=['script', 'style']  # Remove script and style tags
+        )
         
         # Initialize SVG converter if API details provided
         svg_converter = None
         if svg_api_base_url or svg_api_key:
             try:
-                svg_converter = SVGToD2Converter(svg_api_base_url, svg_api_key, svg_model)
+                svg_converter = SVGToD2Converter(svg_api_base_url, svg_api_key, svg_model,
+                                                 cache_dir=cache_dir)
                 logger.info("SVG converter initialized")
             except Exception as e:
                 logger.warning(f"Failed to initialize SVG converter: {e}")
         
         self.cleaner = ContentCleaner(svg_converter)
         
-    def extract_main_content(self, html_content: str, url: str = None) -> Optional[BeautifulSoup]:
+    def extract_main_content(self, html_content: Union[str, BeautifulSoup], url: str = None) -> Optional[BeautifulSoup]:
         """
         Extract main content from HTML, removing navigation and other non-content elements.
         
         Args:
-            html_content: Raw HTML content
+            html_content: Raw HTML content, or an already parsed BeautifulSoup document
             url: Optional URL for logging purposes
             
         Returns:
@@ -54,26 +98,17 @@ class MarkdownConverter:
         if not html_content:
             return None
             
-        soup = BeautifulSoup(html_content, 'html.parser')
+        if isinstance(html_content, BeautifulSoup):
+            soup = html_content
+        else:
+            soup = BeautifulSoup(html_content, HTML_PARSER)
         
         # Try multiple selectors for main content, ordered by specificity
-        content_selectors = [
-            'main article',
-            'main .content', 
-            'main',
-            'article',
-            '.content',
-            '.article-content',
-            '#content',
-            '.markdown-body',
-            '.documentation-content',
-            '.page-content',
-            '[role="main"]'
-        ]
-        
         main_content = None
-        for selector in content_selectors:
-            element = soup.select_one(selector)
+        candidates = _CONTENT_SELECTOR.select(soup)
+        for selector, pattern in _CONTENT_SELECTOR_PATTERNS:
+            # First match in document order, as select_one(selector) would return
+            element = next((el for el in candidates if pattern.match(el)), None)
             if element and element.get_text(strip=True):
                 logger.debug(f"Found content using selector: {selector}")
                 main_content = element
@@ -83,9 +118,9 @@ class MarkdownConverter:
         if not main_content:
             body = soup.find('body')
             if body:
-                divs = body.find_all('div', recursive=True)
+                divs, text_lengths = self._div_text_lengths(body)
                 if divs:
-                    main_content = max(divs, key=lambda x: len(x.get_text(strip=True)))
+                    main_content = max(divs, key=lambda x: text_lengths[id(x)])
                 else:
                     main_content = body
                     
@@ -95,10 +130,61 @@ class MarkdownConverter:
             
         return main_content
         
+    @staticmethod
+    def _div_text_lengths(root) -> Tuple[List[Tag], Dict[int, int]]:
+        """
+        Collect every div below root and measure its stripped text length in one pass.
+        
+        Each text node is credited to its nearest enclosing div only; totals are
+        then rolled up from inner to outer divs in reverse document order. This
+        gives the same numbers as len(div.get_text(strip=True)) without
+        re-walking every div's subtree or every text node's full ancestry.
+        
+        Args:
+            root: BeautifulSoup element to measure
+            
+        Returns:
+            Tuple of (divs in document order, dict mapping id() of each div to its text length)
+        """
+        def nearest_div(node):
+            for parent in node.parents:
+                if parent is root:
+                    return None
+                if parent.name == 'div':
+                    return parent
+            return None
+            
+        divs = []
+        lengths = {}
+        enclosing = {}
+        for node in root.descendants:
+            node_type = type(node)
+            if node_type is Tag:
+                if node.name == 'div':
+                    divs.append(node)
+                    lengths[id(node)] = 0
+                    enclosing[id(node)] = nearest_div(node)
+            elif node_type is NavigableString or node_type is CData:
+                length = len(node.strip())
+                if length:
+                    div = nearest_div(node)
+                    if div is not None:
+                        lengths[id(div)] += length
+                        
+        # Descendants always follow their ancestors in document order
+        for div in reversed(divs):
+            parent = enclosing[id(div)]
+            if parent is not None:
+                lengths[id(parent)] += lengths[id(div)]
+        return divs, lengths
+        
     def html_to_markdown(self, html_element) -> str:
         """
         Convert HTML element to Markdown.
         
+        A BeautifulSoup element is converted from a copy rather than by
+        serializing and re-parsing it, so the caller's tree is left untouched.
+        
         Args:
             html_element: BeautifulSoup element or HTML string
             
@@ -109,23 +195,35 @@ class MarkdownConverter:
             return ""
             
         # Handle different input types
-        if isinstance(html_element, str):
-            html_content = html_element
-        elif hasattr(html_element, 'name'):  # BeautifulSoup Tag
-            html_content = str(html_element)
+        if isinstance(html_element, BeautifulSoup):
+            document = copy.copy(html_element)
+        elif isinstance(html_element, Tag):
+            document = self._as_document(copy.copy(html_element))
         else:
-            html_content = str(html_element)
-            
+            document = BeautifulSoup(str(html_element), HTML_PARSER)
+        return self._document_to_markdown(document)
+        
+    @staticmethod
+    def _as_document(element: Tag) -> BeautifulSoup:
+        """
+        Move a detached element into a document of its own.
+        
+        Converting it there matches converting its re-parsed HTML: navigation
+        selectors can match the element itself, and markdownify sees none of
+        its former ancestors, which would otherwise change nested list bullets.
+        """
+        document = BeautifulSoup('', HTML_PARSER)
+        document.append(element)
+        return document
+        
+    def _document_to_markdown(self, document: BeautifulSoup) -> str:
+        """Convert a document owned by the converter, stripping navigation from it in place."""
         # Strip navigation elements if requested
         if self.strip_navigation:
-            html_content = self.cleaner.remove_navigation_elements(html_content)
+            self.cleaner.remove_navigation_from_soup(document)
             
         # Convert to markdown
-        markdown = markdownify(
-            html_content, 
-            heading_style=self.heading_style,
-            strip=['script', 'style']  # Remove script and style tags
-        )
+        markdown = self._markdownify.convert_soup(document)
         
         # Clean up the markdown
         markdown = self._clean_markdown(markdown)
@@ -137,29 +235,20 @@ class MarkdownConverter:
         if not markdown:
             return ""
             
-        lines = markdown.split('\n')
-        cleaned_lines = []
-        
-        # Remove excessive empty lines
-        prev_empty = False
-        for line in lines:
-            line = line.rstrip()
-            is_empty = not line
-            
-            if is_empty and prev_empty:
-                continue  # Skip multiple consecutive empty lines
-                
-            cleaned_lines.append(line)
-            prev_empty = is_empty
-            
-        return '\n'.join(cleaned_lines).strip()
+        # Strip line endings, then collapse consecutive empty lines into one
+        markdown = _TRAILING_WHITESPACE_RE.sub('', markdown)
+        return _EXCESS_NEWLINES_RE.sub('\n\n', markdown).strip()
         
-    def convert_page(self, html_content: str, url: str = None) -> Dict[str, Any]:
+    def convert_page(self, html_content: Union[str, BeautifulSoup], url: str = None) -> Dict[str, Any]:
         """
         Convert a complete page to markdown.
         
+        With a cache directory configured, a page whose HTML was converted
+        before returns the stored result without being parsed again.
+        
         Args:
-            html_content: Raw HTML content
+            html_content: Raw HTML content, or an already parsed BeautifulSoup
+                document, which is modified in place
             url: Optional URL for context
             
         Returns:
@@ -168,6 +257,30 @@ class MarkdownConverter:
             - title: Extracted title
             - success: Whether conversion succeeded
         """
+        if not self.result_cache or not html_content or not isinstance(html_content, str):
+            return self._convert_page(html_content, url)
+            
+        cache_key = self._result_cache_key(html_content)
+        cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            logger.debug(f"Using cached conversion for URL: {url}")
+            return json_loads(cached)
+            
+        result = self._convert_page(html_content, url)
+        if result['success']:
+            self.result_cache.set(cache_key, json_dumps(result))
+        return result
+        
+    def _result_cache_key(self, html_content: str) -> str:
+        """Key a conversion result by the page HTML and every setting that shapes the output."""
+        svg_model = self.svg_model if self.cleaner.svg_converter else None
+        settings = f"{self.heading_style}|{self.strip_navigation}|{svg_model}|"
+        digest = hashlib.sha256(settings.encode('utf-8'))
+        digest.update(html_content.encode('utf-8'))
+        return f"converted:{digest.hexdigest()}"
+        
+    def _convert_page(self, html_content: Union[str, BeautifulSoup], url: str = None) -> Dict[str, Any]:
+        """Convert a complete page to markdown, bypassing the result cache."""
         result = {
             'content': '',
             'title': '',
@@ -175,13 +288,22 @@ class MarkdownConverter:
         }
         
         try:
+            if not html_content:
+                return result
+                
+            # Parse once; content and title extraction share the tree
+            if isinstance(html_content, BeautifulSoup):
+                soup = html_content
+            else:
+                soup = BeautifulSoup(html_content, HTML_PARSER)
+            
             # Extract main content
-            main_content = self.extract_main_content(html_content, url)
+            main_content = self.extract_main_content(soup, url)
             if not main_content:
                 return result
                 
             # Extract title
-            title = self.cleaner.extract_title_from_content(html_content)
+            title = self.cleaner.extract_title_from_soup(soup)
             if title:
                 result['title'] = title
                 
@@ -190,20 +312,21 @@ class MarkdownConverter:
             if self.cleaner.svg_converter:
                 html_content = str(main_content)
                 html_content, svg_replacements = self.cleaner.extract_and_convert_svgs(html_content)
-                main_content = BeautifulSoup(html_content, 'html.parser')
+                main_content = BeautifulSoup(html_content, HTML_PARSER)
             
-            # Convert to markdown
-            markdown_content = self.html_to_markdown(main_content)
+            # Convert to markdown; the page tree is already ours, so the
+            # content is moved out of it rather than copied
+            if not isinstance(main_content, BeautifulSoup):
+                main_content = self._as_document(main_content.extract())
+            markdown_content = self._document_to_markdown(main_content)
             if markdown_content:
                 # Insert SVG ASCII diagrams
                 if svg_replacements:
                     markdown_content = self.cleaner.insert_svg_replacements(markdown_content, svg_replacements)
                 # Clean markdown links
                 markdown_content = self.cleaner.clean_markdown_links(markdown_content)
-                # Remove DeepWiki navigation and promotional chrome
-                markdown_content = self.cleaner.remove_deepwiki_chrome(markdown_content)
-                # Filter out CSS/Mermaid content
-                markdown_content = self.cleaner.filter_css_mermaid_content(markdown_content)
+                # Remove DeepWiki navigation, promotional chrome and CSS/Mermaid content
+                markdown_content = self.cleaner.clean_markdown_content(markdown_content)
                 result['content'] = markdown_content
                 result['success'] = True
                 
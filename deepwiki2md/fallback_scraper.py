@@ -1,40 +1,86 @@
 """Fallback scraper using requests when PyDoll is not available."""
 
+import asyncio
+import functools
 import logging
-import requests
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Any, Optional
-from urllib.parse import urljoin
-from bs4 import BeautifulSoup
 
 from .converter import MarkdownConverter
-from .utils import DeepWikiURL, FileUtils
+from .utils import DeepWikiURL, FileUtils, PageCache, parse_deepwiki_url, extract_navigation_items, get_http_session
 
 logger = logging.getLogger(__name__)
 
-
 class FallbackScraper:
-    """Fallback scraper using requests when PyDoll browser automation is not available."""
+    """
+    Fallback scraper using requests when PyDoll browser automation is not available.
+    
+    Exposes the same async interface as DeepWikiScraper. Blocking requests and
+    markdown conversion run on a worker thread pool so they never stall the
+    event loop. Use it as an async context manager, or call close(), to shut
+    that pool down when done. It also takes DeepWikiScraper's constructor
+    arguments, so either class can be built from the same settings.
+    """
     
-    def __init__(self, output_dir: str = "output"):
+    def __init__(self, output_dir: str = "output", max_workers: int = 8, cache_dir: Optional[str] = None,
+                 cache_ttl: Optional[float] = 24 * 60 * 60, converter_kwargs: dict = None,
+                 max_concurrency: Optional[int] = None, **browser_options):
         """
         Initialize the fallback scraper.
         
         Args:
             output_dir: Directory to save markdown files
+            max_workers: Maximum number of blocking fetches/conversions in flight
+            cache_dir: Directory for caching fetched page HTML (disabled if None)
+            cache_ttl: Seconds before a cached page is revalidated with the server
+            converter_kwargs: Additional kwargs for MarkdownConverter
+            max_concurrency: DeepWikiScraper's name for max_workers; overrides it if given
+            **browser_options: DeepWikiScraper's browser settings (headless, prefer_static,
+                convert_processes, block_resources, page_retries), ignored since no
+                browser is used
         """
+        if browser_options:
+            logger.debug(f"Ignoring browser options: {', '.join(sorted(browser_options))}")
         self.output_dir = Path(output_dir)
-        self.converter = MarkdownConverter()
+        self.max_workers = max(1, max_workers if max_concurrency is None else max_concurrency)
+        converter_kwargs = dict(converter_kwargs or {})
+        if cache_dir:
+            # Unchanged pages also skip conversion, not just the fetch
+            converter_kwargs.setdefault('cache_dir', str(Path(cache_dir) / 'converted'))
+        self.converter = MarkdownConverter(**converter_kwargs)
         self.file_utils = FileUtils()
         
         # Ensure output directory exists
         self.file_utils.ensure_directory(self.output_dir)
+        # Library directories already created, so saves skip repeated mkdir calls
+        self._library_dirs = set()
+        
+        self.page_cache = PageCache(cache_dir, cache_ttl) if cache_dir else None
+        
+        # Shared session with headers to mimic a browser, pooling enough
+        # connections for every worker thread
+        self.session = get_http_session(self.max_workers)
+        
+        # Runs blocking requests and conversion calls off the event loop
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        
+    async def __aenter__(self) -> 'FallbackScraper':
+        """Return the scraper; its worker threads are released when the block exits."""
+        return self
         
-        # Set up session with headers to mimic a browser
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        """Release the worker thread pool."""
+        await self.close()
+        
+    async def close(self) -> None:
+        """Shut down the worker thread pool; the scraper cannot be used afterwards."""
+        self._executor.shutdown(wait=False)
+        
+    async def _run_blocking(self, func, *args):
+        """Run a blocking call on the worker pool and await its result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args))
         
     def _get_page_content(self, url: str, timeout: int = 30) -> Optional[str]:
         """
@@ -47,10 +93,26 @@ class FallbackScraper:
         Returns:
             HTML content or None if failed
         """
+        cached = None
+        if self.page_cache:
+            cached_html = self.page_cache.get(url)
+            if cached_html is not None:
+                logger.info(f"Using cached page: {url}")
+                return cached_html
+            cached = self.page_cache.get_entry(url)
+            
         try:
             logger.info(f"Fetching: {url}")
-            response = self.session.get(url, timeout=timeout)
+            # Revalidate an expired entry so an unchanged page costs no body transfer
+            headers = {'If-None-Match': cached[1]} if cached and cached[1] else None
+            response = self.session.get(url, timeout=timeout, headers=headers)
+            if response.status_code == 304 and cached:
+                logger.info(f"Cached page still current: {url}")
+                self.page_cache.touch(url)
+                return cached[0]
             response.raise_for_status()
+            if self.page_cache:
+                self.page_cache.set(url, response.text, response.headers.get('ETag'))
             return response.text
             
         except Exception as e:
@@ -66,47 +128,9 @@ class FallbackScraper:
             base_url: Base URL for resolving relative links
             
         Returns:
-            List of navigation items with title and url
+            List of navigation items with title and url, unique by url
         """
-        if not html_content:
-            return []
-            
-        soup = BeautifulSoup(html_content, 'html.parser')
-        nav_items = []
-        
-        # Try different selectors for navigation
-        nav_selectors = [
-            'ul.flex-1.flex-shrink-0.space-y-1.overflow-y-auto.py-1',
-            'nav ul',
-            '.navigation ul',
-            '.sidebar ul',
-            '.menu ul',
-            'ul[class*="nav"]',
-            'ul[class*="menu"]'
-        ]
-        
-        for selector in nav_selectors:
-            nav_ul = soup.select_one(selector)
-            if nav_ul:
-                logger.debug(f"Found navigation using selector: {selector}")
-                
-                for li in nav_ul.find_all('li'):
-                    a_tag = li.find('a')
-                    if a_tag and a_tag.get('href'):
-                        title = a_tag.get_text(strip=True)
-                        href = a_tag.get('href')
-                        full_url = urljoin(base_url, href)
-                        
-                        if title and full_url:
-                            nav_items.append({
-                                'title': title,
-                                'url': full_url
-                            })
-                            
-                break  # Use first successful selector
-                
-        logger.info(f"Found {len(nav_items)} navigation items")
-        return nav_items
+        return extract_navigation_items(html_content, base_url)
         
     def _save_markdown(self, content: str, title: str, library_name: str) -> Path:
         """
@@ -120,8 +144,11 @@ class FallbackScraper:
         Returns:
             Path to saved file
         """
-        # Create library directory
-        library_dir = self.file_utils.ensure_directory(self.output_dir / library_name)
+        # Create library directory on first save
+        library_dir = self.output_dir / library_name
+        if library_dir not in self._library_dirs:
+            self.file_utils.ensure_directory(library_dir)
+            self._library_dirs.add(library_dir)
         
         # Sanitize filename
         filename = self.file_utils.sanitize_filename(title or "untitled")
@@ -130,41 +157,82 @@ class FallbackScraper:
             
         file_path = library_dir / filename
         
-        # Write content
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        # Write content as one encoded buffer, bypassing text-mode chunking
+        file_path.write_bytes(content.encode('utf-8'))
             
         logger.info(f"Saved: {file_path}")
         return file_path
         
-    def scrape_page(self, url: str) -> Optional[Dict[str, Any]]:
+    def _save_pages(self, pages: List[Dict[str, Any]], library_name: str) -> None:
+        """Save scraped pages in order, so duplicate titles resolve deterministically."""
+        for page_data in pages:
+            self._save_markdown(page_data['content'], page_data['title'], library_name)
+        
+    async def scrape_page(self, url: str, keep_html: bool = False) -> Optional[Dict[str, Any]]:
         """
         Scrape a single page and convert to markdown.
         
         Args:
             url: URL to scrape
+            keep_html: Include the raw page HTML under 'html' in the result
             
         Returns:
             Dictionary with scraped content or None if failed
         """
-        html_content = self._get_page_content(url)
+        html_content = await self._run_blocking(self._get_page_content, url)
         
         if not html_content:
             return None
             
         # Convert to markdown
-        result = self.converter.convert_page(html_content, url)
+        result = await self._run_blocking(self.converter.convert_page, html_content, url)
         if result['success']:
-            return {
+            page_data = {
                 'url': url,
                 'title': result['title'],
-                'content': result['content'],
-                'html': html_content
+                'content': result['content']
             }
+            # Raw HTML is often hundreds of KB, so it is only held on to on request
+            if keep_html:
+                page_data['html'] = html_content
+            return page_data
             
         return None
         
-    def scrape_library(self, url: str, save_files: bool = True) -> List[Dict[str, Any]]:
+    async def _scrape_nav_item(self, item: Dict[str, str], index: int, total: int,
+                               page_html: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Fetch and convert a single navigation item.
+        
+        Args:
+            item: Navigation item with title and url
+            index: 1-based position of the item, for logging
+            total: Total number of navigation items, for logging
+            page_html: Already fetched HTML for the item, skipping the request
+            
+        Returns:
+            Dictionary with scraped content or None if failed
+        """
+        logger.info(f"Processing {index}/{total}: {item['title']}")
+        if page_html is None:
+            page_html = await self._run_blocking(self._get_page_content, item['url'])
+        if not page_html:
+            logger.warning(f"Failed to fetch: {item['title']}")
+            return None
+            
+        # Convert to markdown
+        result = await self._run_blocking(self.converter.convert_page, page_html, item['url'])
+        if not result['success']:
+            logger.warning(f"Failed to convert: {item['title']}")
+            return None
+            
+        return {
+            'url': item['url'],
+            'title': result['title'] or item['title'],
+            'content': result['content']
+        }
+        
+    async def scrape_library(self, url: str, save_files: bool = True) -> List[Dict[str, Any]]:
         """
         Scrape an entire DeepWiki library.
         
@@ -175,7 +243,7 @@ class FallbackScraper:
         Returns:
             List of scraped pages
         """
-        deepwiki_url = DeepWikiURL(url)
+        deepwiki_url = parse_deepwiki_url(url)
         
         if not deepwiki_url.is_valid_deepwiki():
             logger.error(f"Invalid DeepWiki URL: {url}")
@@ -187,18 +255,20 @@ class FallbackScraper:
         scraped_pages = []
         
         # Get main page content
-        main_html = self._get_page_content(url)
+        main_html = await self._run_blocking(self._get_page_content, url)
         if not main_html:
             logger.error(f"Failed to fetch main page: {url}")
             return []
             
         # Extract navigation items
-        nav_items = self._extract_navigation_items(main_html, deepwiki_url.get_base_url())
+        nav_items = await self._run_blocking(
+            self._extract_navigation_items, main_html, deepwiki_url.get_base_url()
+        )
         
         # If no navigation found, just process the main page
         if not nav_items:
             logger.warning("No navigation items found, processing main page only")
-            result = self.converter.convert_page(main_html, url)
+            result = await self._run_blocking(self.converter.convert_page, main_html, url)
             if result['success']:
                 page_data = {
                     'url': url,
@@ -208,63 +278,63 @@ class FallbackScraper:
                 scraped_pages.append(page_data)
                 
                 if save_files:
-                    self._save_markdown(
-                        page_data['content'],
-                        page_data['title'],
-                        library_name
-                    )
+                    await self._run_blocking(self._save_pages, scraped_pages, library_name)
             return scraped_pages
             
-        # Process each navigation item
-        for i, item in enumerate(nav_items, 1):
-            logger.info(f"Processing {i}/{len(nav_items)}: {item['title']}")
+        # Fetch and convert navigation items concurrently; the worker pool
+        # bounds how many requests are in flight.
+        # A nav entry pointing back at the library page reuses main_html.
+        results = await asyncio.gather(*[
+            self._scrape_nav_item(
+                item, i, len(nav_items),
+                main_html if item['url'].rstrip('/') == deepwiki_url.url else None
+            )
+            for i, item in enumerate(nav_items, 1)
+        ])
             
-            page_html = self._get_page_content(item['url'])
-            if not page_html:
-                logger.warning(f"Failed to fetch: {item['title']}")
-                continue
-                
-            # Convert to markdown
-            result = self.converter.convert_page(page_html, item['url'])
-            if result['success']:
-                page_data = {
-                    'url': item['url'],
-                    'title': result['title'] or item['title'],
-                    'content': result['content']
-                }
-                scraped_pages.append(page_data)
-                
-                if save_files:
-                    self._save_markdown(
-                        page_data['content'],
-                        page_data['title'],
-                        library_name
-                    )
-            else:
-                logger.warning(f"Failed to convert: {item['title']}")
+        scraped_pages = [page_data for page_data in results if page_data]
+        
+        # Disk writes run on the worker pool so other libraries keep scraping
+        if save_files:
+            await self._run_blocking(self._save_pages, scraped_pages, library_name)
                 
         logger.info(f"Scraped {len(scraped_pages)} pages from {library_name}")
         return scraped_pages
         
-    def scrape_multiple_libraries(self, urls: List[str], save_files: bool = True) -> Dict[str, List[Dict[str, Any]]]:
+    async def scrape_multiple_libraries(self, urls: List[str], save_files: bool = True,
+                                        max_concurrent_libraries: int = 4) -> Dict[str, List[Dict[str, Any]]]:
         """
-        Scrape multiple DeepWiki libraries.
+        Scrape multiple DeepWiki libraries concurrently.
         
         Args:
             urls: List of DeepWiki library URLs
             save_files: Whether to save markdown files
+            max_concurrent_libraries: Maximum number of libraries scraped at once
             
         Returns:
             Dictionary mapping library names to scraped pages
         """
-        results = {}
-        
+        library_names = []
+        seen_names = {}
         for url in urls:
-            deepwiki_url = DeepWikiURL(url)
-            library_name = deepwiki_url.library_name or f"library_{len(results)}"
+            deepwiki_url = parse_deepwiki_url(url)
+            library_name = deepwiki_url.library_name or f"library_{len(seen_names)}"
+            seen_names[library_name] = None
+            library_names.append(library_name)
             
-            logger.info(f"Starting library: {library_name}")
-            pages = self.scrape_library(url, save_files)
+        semaphore = asyncio.Semaphore(max(1, max_concurrent_libraries))
+        
+        async def scrape(url: str, library_name: str) -> List[Dict[str, Any]]:
+            async with semaphore:
+                logger.info(f"Starting library: {library_name}")
+                return await self.scrape_library(url, save_files)
+                
+        all_pages = await asyncio.gather(*[
+            scrape(url, library_name) for url, library_name in zip(urls, library_names)
+        ])
+        
+        results = {}
+        for library_name, pages in zip(library_names, all_pages):
             results[library_name] = pages
             
         return results
\ No newline at end of file
@@ -1,25 +1,103 @@
 """Main scraper class using PyDoll for DeepWiki content extraction."""
 
 import asyncio
+import functools
 import logging
+import random
+import re
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import AsyncExitStack, asynccontextmanager, suppress
 from pathlib import Path
 from typing import List, Dict, Any, Optional
-from urllib.parse import urljoin
 
 from pydoll.browser.chromium import Chrome
 from pydoll.browser.options import ChromiumOptions
-from bs4 import BeautifulSoup
 
 from .converter import MarkdownConverter
-from .utils import DeepWikiURL, FileUtils, ContentCleaner
+from .utils import (
+    DeepWikiURL, FileUtils, ContentCleaner, PageCache, parse_deepwiki_url, extract_navigation_items,
+    get_http_session, NAV_LIST_SELECTORS
+)
 
 logger = logging.getLogger(__name__)
 
+# DeepWiki's sidebar. It is already in the server HTML, so finding it only
+# shows the page has loaded, not that its diagrams are drawn.
+_READY_SELECTOR = NAV_LIST_SELECTORS[0]
+# Longest wait for it in seconds, the fixed delay pages used to get
+_READY_TIMEOUT = 2
+# Mermaid source blocks, and the diagram SVGs Mermaid draws from them in the browser
+_DIAGRAM_SOURCE_SELECTOR = 'pre.mermaid, .language-mermaid'
+_DIAGRAM_SELECTOR = 'svg[aria-roledescription^="flowchart"]'
+# Seconds every page is given to settle before a render check, the fallback
+# for content nothing signals; the poll interval; and the longest wait for
+# diagrams to be drawn
+_RENDER_SETTLE = 0.3
+_RENDER_POLL = 0.1
+_RENDER_TIMEOUT = 10
+# Seconds before the first retry of a failed navigation, doubling with each further attempt
+_RETRY_BACKOFF = 0.5
+# Sidebar class prefix showing that plain HTTP already returned the rendered page
+_STATIC_READY_MARKER = b'flex-1 flex-shrink-0'
+# Mermaid source the browser has yet to render into the flowchart SVGs that
+# SVG conversion looks for; server HTML holding it still needs the browser
+_UNRENDERED_DIAGRAM_RE = re.compile(rb'language-mermaid|class="mermaid"')
+# Subresources that never affect the page HTML, blocked so tabs skip downloading them
+_BLOCKED_URL_PATTERNS = (
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf',
+    '*.mp4', '*.webm', '*.mp3',
+    '*google-analytics.com*', '*googletagmanager.com*',
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _worker_converter(converter_items: tuple) -> MarkdownConverter:
+    """Build one converter per worker process for a given set of converter kwargs."""
+    return MarkdownConverter(**dict(converter_items))
+
+
+def _convert_page_worker(converter_items: tuple, html_content: str, url: str) -> Dict[str, Any]:
+    """Convert a page in a worker process (module-level so it can be pickled)."""
+    return _worker_converter(converter_items).convert_page(html_content, url)
+
+
+class _NavigationFailed(Exception):
+    """Raised inside a pooled tab's block when navigating it returned no HTML."""
+
+
+class _LazyBrowser:
+    """Stand-in for a browser that launches Chrome only when the first tab is needed."""
+    
+    def __init__(self, options: ChromiumOptions, stack: AsyncExitStack):
+        self._options = options
+        self._stack = stack
+        self._browser = None
+        self._lock = asyncio.Lock()
+        
+    async def new_tab(self):
+        """Open a tab, launching the browser on first use."""
+        async with self._lock:
+            if self._browser is None:
+                self._browser = await self._stack.enter_async_context(Chrome(options=self._options))
+                return await self._browser.start()
+        return await self._browser.new_tab()
+
 
 class DeepWikiScraper:
-    """Main scraper class for extracting DeepWiki content using PyDoll."""
+    """
+    Main scraper class for extracting DeepWiki content using PyDoll.
     
-    def __init__(self, output_dir: str = "output", headless: bool = True, converter_kwargs: dict = None):
+    Used as an async context manager, one browser and its tabs are kept open
+    and reused by every scrape until the block exits. Otherwise each scrape
+    launches and closes its own browser. Either way the browser is only
+    launched once a page actually needs rendering.
+    """
+    
+    def __init__(self, output_dir: str = "output", headless: bool = True, converter_kwargs: dict = None,
+                 max_concurrency: int = 3, cache_dir: Optional[str] = None,
+                 cache_ttl: Optional[float] = 24 * 60 * 60, prefer_static: bool = False,
+                 convert_processes: int = 0, block_resources: bool = True, page_retries: int = 2):
         """
         Initialize the scraper.
         
@@ -27,14 +105,232 @@ class DeepWikiScraper:
             output_dir: Directory to save markdown files
             headless: Whether to run browser in headless mode
             converter_kwargs: Additional kwargs for MarkdownConverter
+            max_concurrency: Maximum number of pages fetched at once, shared by every
+                library this scraper works on; also bounds the number of open tabs
+            cache_dir: Directory for caching rendered page HTML (disabled if None)
+            cache_ttl: Seconds a cached page stays valid, or None to never expire
+            prefer_static: Try a plain HTTP fetch first and only render pages it can't serve.
+                Off by default: the server HTML lacks anything rendered by JavaScript
+                other than the sidebar, so pages with unrendered diagrams still go to
+                the browser, but other client-rendered content would be missed
+            convert_processes: Worker processes for markdown conversion; 0 converts on a
+                thread in this process instead
+            block_resources: Stop tabs from loading images, fonts, media and analytics
+            page_retries: Extra attempts, with exponential backoff, for a page whose
+                browser navigation fails
         """
         self.output_dir = Path(output_dir)
         self.headless = headless
-        self.converter = MarkdownConverter(**(converter_kwargs or {}))
+        self.max_concurrency = max(1, max_concurrency)
+        converter_kwargs = dict(converter_kwargs or {})
+        if cache_dir:
+            # Unchanged pages also skip conversion, not just the fetch
+            converter_kwargs.setdefault('cache_dir', str(Path(cache_dir) / 'converted'))
+        self.converter = MarkdownConverter(**converter_kwargs)
         self.file_utils = FileUtils()
         
+        # Conversion is CPU-bound, so worker processes let pages convert in
+        # parallel; workers rebuild the converter from its kwargs
+        self.convert_processes = max(0, convert_processes)
+        self._converter_items = tuple(sorted(converter_kwargs.items()))
+        self._convert_pool = None
+        # Scrapes running outside a context manager; the last one to finish
+        # shuts the worker processes down
+        self._temporary_sessions = 0
+        
         # Ensure output directory exists
         self.file_utils.ensure_directory(self.output_dir)
+        # Library directories already created, so saves skip repeated mkdir calls
+        self._library_dirs = set()
+        
+        self.page_cache = PageCache(cache_dir, cache_ttl) if cache_dir else None
+        
+        # Most DeepWiki pages are server-rendered, so with this on most never need the browser
+        self.prefer_static = prefer_static
+        self._session = get_http_session(self.max_concurrency) if prefer_static else None
+        
+        self.block_resources = block_resources
+        self.page_retries = max(0, page_retries)
+        
+        # Long-lived browser, the stack that closes it, and its idle tabs while
+        # used as a context manager
+        self._browser = None
+        self._browser_stack = None
+        self._idle_tabs = []
+        
+        # Page fetches running at once across all scrapes of this instance, so
+        # concurrent libraries share one pool of at most max_concurrency tabs.
+        # Created on first use, since a semaphore belongs to one event loop.
+        self._fetch_slots = None
+        self._fetch_slots_loop = None
+        
+    async def __aenter__(self) -> 'DeepWikiScraper':
+        """Open a browser that every scrape on this instance reuses, launched on first use."""
+        self._browser_stack = AsyncExitStack()
+        self._browser = _LazyBrowser(self._browser_options(), self._browser_stack)
+        self._idle_tabs = []
+        return self
+        
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        """Close the shared browser, if it was launched, and any conversion worker processes."""
+        stack, self._browser_stack = self._browser_stack, None
+        self._browser = None
+        self._idle_tabs = []
+        self._shutdown_convert_pool()
+        if stack is not None:
+            await stack.__aexit__(exc_type, exc, tb)
+            
+    def _shutdown_convert_pool(self) -> None:
+        """Stop the conversion worker processes, if any were started."""
+        pool, self._convert_pool = self._convert_pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
+            
+    async def _convert_page(self, html_content: str, url: str) -> Dict[str, Any]:
+        """Convert a page off the event loop, in a worker process when configured."""
+        loop = asyncio.get_running_loop()
+        if not self.convert_processes:
+            return await loop.run_in_executor(None, self.converter.convert_page, html_content, url)
+        if self._convert_pool is None:
+            self._convert_pool = ProcessPoolExecutor(max_workers=self.convert_processes)
+        return await loop.run_in_executor(
+            self._convert_pool, _convert_page_worker, self._converter_items, html_content, url
+        )
+            
+    def _browser_options(self) -> ChromiumOptions:
+        """Build the Chromium launch options."""
+        options = ChromiumOptions()
+        if self.headless:
+            options.add_argument("--headless=new")
+            options.add_argument("--no-sandbox")
+            options.add_argument("--disable-dev-shm-usage")
+            options.add_argument("--disable-gpu")
+            options.add_argument("--window-size=1920,1080")
+        return options
+        
+    @asynccontextmanager
+    async def _browser_session(self):
+        """
+        Yield the shared browser and its idle tabs, or a temporary browser if none is open.
+        
+        A temporary browser is only launched once a page actually needs
+        rendering, and is closed when the session ends. Conversion worker
+        processes are likewise stopped once no temporary session is left,
+        so scrapes outside a context manager don't leave them running.
+        """
+        if self._browser is not None:
+            yield self._browser, self._idle_tabs
+            return
+        self._temporary_sessions += 1
+        try:
+            async with AsyncExitStack() as stack:
+                yield _LazyBrowser(self._browser_options(), stack), []
+        finally:
+            self._temporary_sessions -= 1
+            if not self._temporary_sessions and self._browser is None:
+                self._shutdown_convert_pool()
+            
+    def _fetch_slot(self) -> asyncio.Semaphore:
+        """Return the semaphore bounding page fetches, creating it for the running loop."""
+        loop = asyncio.get_running_loop()
+        if self._fetch_slots is None or self._fetch_slots_loop is not loop:
+            self._fetch_slots = asyncio.Semaphore(self.max_concurrency)
+            self._fetch_slots_loop = loop
+        return self._fetch_slots
+        
+    async def _fetch_page(self, browser, idle_tabs: list, url: str, timeout: int = 30,
+                          delay: float = 0) -> Optional[str]:
+        """
+        Get a page's HTML from the cache, a plain HTTP fetch, or a pooled tab, cheapest first.
+        
+        Cache misses hold one of the scraper's max_concurrency fetch slots, so
+        no more than that many pages load, and tabs are open, at once.
+        
+        Args:
+            browser: Running or lazily launched PyDoll browser
+            idle_tabs: Pool of idle tabs of the browser
+            url: URL to fetch
+            timeout: Timeout in seconds
+            delay: Seconds to wait, holding the slot, before fetching
+            
+        Returns:
+            HTML content or None if failed
+        """
+        if self.page_cache:
+            cached_html = self.page_cache.get(url)
+            if cached_html is not None:
+                logger.info(f"Using cached page: {url}")
+                return cached_html
+                
+        async with self._fetch_slot():
+            if delay:
+                await asyncio.sleep(delay)
+            return await self._fetch_uncached(browser, idle_tabs, url, timeout)
+            
+    async def _fetch_uncached(self, browser, idle_tabs: list, url: str, timeout: int) -> Optional[str]:
+        """Fetch a page missing from the cache over plain HTTP or in a pooled tab."""
+        if self.prefer_static:
+            loop = asyncio.get_running_loop()
+            html_content = await loop.run_in_executor(None, self._fetch_static, url, timeout)
+            if html_content:
+                if self.page_cache:
+                    self.page_cache.set(url, html_content)
+                return html_content
+                
+        # A transient navigation failure only costs this page a retry, rather
+        # than dropping it from the library
+        for attempt in range(self.page_retries + 1):
+            if attempt:
+                delay = _RETRY_BACKOFF * 2 ** (attempt - 1)
+                logger.info(f"Retrying {url} in {delay:.1f}s (attempt {attempt + 1}/{self.page_retries + 1})")
+                await asyncio.sleep(delay)
+            # A tab that failed to load the page is closed rather than pooled,
+            # so the next attempt gets a fresh one
+            try:
+                async with self._pooled_tab(browser, idle_tabs) as tab:
+                    html_content = await self._get_page_content(tab, url, timeout)
+                    if not html_content:
+                        raise _NavigationFailed(url)
+            except _NavigationFailed:
+                continue
+            return html_content
+        return None
+            
+    async def _prepare_tab(self, tab) -> None:
+        """Configure a newly opened tab before its first navigation."""
+        if not self.block_resources:
+            return
+        try:
+            await tab.execute_command({'method': 'Network.enable', 'params': {}})
+            await tab.execute_command({
+                'method': 'Network.setBlockedURLs',
+                'params': {'urls': list(_BLOCKED_URL_PATTERNS)}
+            })
+        except Exception as e:
+            logger.debug(f"Could not block subresources for tab: {e}")
+            
+    @asynccontextmanager
+    async def _pooled_tab(self, browser, idle_tabs: list):
+        """
+        Borrow an idle tab, opening a new one only when all are busy.
+        
+        The tab goes back to the pool afterwards, unless an exception leaves the
+        block, in which case it is closed instead. _get_page_content reports
+        failures by returning None, so callers that want a failed tab discarded
+        must raise (as _fetch_page does with _NavigationFailed).
+        """
+        if idle_tabs:
+            tab = idle_tabs.pop()
+        else:
+            tab = await browser.new_tab()
+            await self._prepare_tab(tab)
+        try:
+            yield tab
+        except BaseException:
+            with suppress(Exception):
+                await tab.close()
+            raise
+        idle_tabs.append(tab)
         
     async def _get_page_content(self, tab, url: str, timeout: int = 30) -> Optional[str]:
         """
@@ -52,17 +348,69 @@ class DeepWikiScraper:
             logger.info(f"Navigating to: {url}")
             await tab.go_to(url)
             
-            # Wait for page to load
-            await asyncio.sleep(2)
+            await tab.query(_READY_SELECTOR, timeout=_READY_TIMEOUT, raise_exc=False)
+            await self._wait_for_diagrams(tab, url)
             
             # Get page HTML
             html_content = await tab.page_source
+            if self.page_cache and html_content:
+                self.page_cache.set(url, html_content)
             return html_content
             
         except Exception as e:
             logger.error(f"Error fetching content from {url}: {e}")
             return None
     
+    async def _wait_for_diagrams(self, tab, url: str) -> None:
+        """
+        Wait until Mermaid has drawn a diagram for each diagram source block on the page.
+        
+        Pages without diagram source only wait out the settle time. The wait
+        gives up after _RENDER_TIMEOUT, reading the page as it is.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + _RENDER_TIMEOUT
+        await asyncio.sleep(_RENDER_SETTLE)
+        while True:
+            sources = await tab.query(_DIAGRAM_SOURCE_SELECTOR, find_all=True, raise_exc=False) or []
+            if not sources:
+                return
+            # Mermaid may draw into the source block itself, so the blocks
+            # can outlive rendering; compare counts instead
+            diagrams = await tab.query(_DIAGRAM_SELECTOR, find_all=True, raise_exc=False) or []
+            if len(diagrams) >= len(sources):
+                return
+            if loop.time() >= deadline:
+                logger.warning(f"Diagrams not rendered after {_RENDER_TIMEOUT}s, reading page as is: {url}")
+                return
+            await asyncio.sleep(_RENDER_POLL)
+            
+    def _fetch_static(self, url: str, timeout: int) -> Optional[str]:
+        """
+        Fetch a page over plain HTTP, without the browser.
+        
+        Args:
+            url: URL to fetch
+            timeout: Timeout in seconds
+            
+        Returns:
+            HTML content, or None if the response doesn't already hold the rendered page
+        """
+        try:
+            logger.info(f"Fetching: {url}")
+            response = self._session.get(url, timeout=timeout)
+        except Exception as e:
+            logger.debug(f"Plain fetch failed for {url}, using the browser: {e}")
+            return None
+            
+        if response.status_code != 200 or _STATIC_READY_MARKER not in response.content:
+            logger.debug(f"Page needs rendering, using the browser: {url}")
+            return None
+        if _UNRENDERED_DIAGRAM_RE.search(response.content):
+            logger.debug(f"Page has diagrams to render, using the browser: {url}")
+            return None
+        return response.text
+        
     async def _extract_navigation_items(self, html_content: str, base_url: str) -> List[Dict[str, str]]:
         """
         Extract navigation items from HTML content.
@@ -72,47 +420,11 @@ class DeepWikiScraper:
             base_url: Base URL for resolving relative links
             
         Returns:
-            List of navigation items with title and url
+            List of navigation items with title and url, unique by url
         """
-        if not html_content:
-            return []
-            
-        soup = BeautifulSoup(html_content, 'html.parser')
-        nav_items = []
-        
-        # Try different selectors for navigation
-        nav_selectors = [
-            'ul.flex-1.flex-shrink-0.space-y-1.overflow-y-auto.py-1',
-            'nav ul',
-            '.navigation ul',
-            '.sidebar ul',
-            '.menu ul',
-            'ul[class*="nav"]',
-            'ul[class*="menu"]'
-        ]
-        
-        for selector in nav_selectors:
-            nav_ul = soup.select_one(selector)
-            if nav_ul:
-                logger.debug(f"Found navigation using selector: {selector}")
-                
-                for li in nav_ul.find_all('li'):
-                    a_tag = li.find('a')
-                    if a_tag and a_tag.get('href'):
-                        title = a_tag.get_text(strip=True)
-                        href = a_tag.get('href')
-                        full_url = urljoin(base_url, href)
-                        
-                        if title and full_url:
-                            nav_items.append({
-                                'title': title,
-                                'url': full_url
-                            })
-                            
-                break  # Use first successful selector
-                
-        logger.info(f"Found {len(nav_items)} navigation items")
-        return nav_items
+        # Parsing runs on a worker thread so open tabs keep being serviced
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, extract_navigation_items, html_content, base_url)
         
     def _save_markdown(self, content: str, title: str, library_name: str) -> Path:
         """
@@ -126,8 +438,11 @@ class DeepWikiScraper:
         Returns:
             Path to saved file
         """
-        # Create library directory
-        library_dir = self.file_utils.ensure_directory(self.output_dir / library_name)
+        # Create library directory on first save
+        library_dir = self.output_dir / library_name
+        if library_dir not in self._library_dirs:
+            self.file_utils.ensure_directory(library_dir)
+            self._library_dirs.add(library_dir)
         
         # Sanitize filename
         filename = self.file_utils.sanitize_filename(title or "untitled")
@@ -136,53 +451,99 @@ class DeepWikiScraper:
             
         file_path = library_dir / filename
         
-        # Write content
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        # Write content as one encoded buffer, bypassing text-mode chunking
+        file_path.write_bytes(content.encode('utf-8'))
             
         logger.info(f"Saved: {file_path}")
         return file_path
         
-    async def scrape_page(self, url: str) -> Optional[Dict[str, Any]]:
+    def _save_pages(self, pages: List[Dict[str, Any]], library_name: str) -> None:
+        """Save scraped pages in order, so duplicate titles resolve deterministically."""
+        for page_data in pages:
+            self._save_markdown(page_data['content'], page_data['title'], library_name)
+            
+    async def _save_pages_async(self, pages: List[Dict[str, Any]], library_name: str) -> None:
+        """Save scraped pages on a worker thread so disk writes never block the event loop."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._save_pages, pages, library_name)
+        
+    async def scrape_page(self, url: str, keep_html: bool = False) -> Optional[Dict[str, Any]]:
         """
         Scrape a single page and convert to markdown.
         
         Args:
             url: URL to scrape
+            keep_html: Include the raw page HTML under 'html' in the result
             
         Returns:
             Dictionary with scraped content or None if failed
         """
-        options = ChromiumOptions()
-        if self.headless:
-            options.add_argument("--headless=new")
-            options.add_argument("--no-sandbox")
-            options.add_argument("--disable-dev-shm-usage")
-            options.add_argument("--disable-gpu")
-            options.add_argument("--window-size=1920,1080")
-        async with Chrome(options=options) as browser:
+        async with self._browser_session() as (browser, idle_tabs):
             try:
-                tab = await browser.start()
-                html_content = await self._get_page_content(tab, url)
+                html_content = await self._fetch_page(browser, idle_tabs, url)
                 
                 if not html_content:
                     return None
                     
                 # Convert to markdown
-                result = self.converter.convert_page(html_content, url)
+                result = await self._convert_page(html_content, url)
                 if result['success']:
-                    return {
+                    page_data = {
                         'url': url,
                         'title': result['title'],
-                        'content': result['content'],
-                        'html': html_content
+                        'content': result['content']
                     }
+                    # Raw HTML is often hundreds of KB, so it is only held on to on request
+                    if keep_html:
+                        page_data['html'] = html_content
+                    return page_data
                     
             except Exception as e:
                 logger.error(f"Error scraping page {url}: {e}")
                 
         return None
         
+    async def _scrape_nav_item(self, browser, idle_tabs: list, item: Dict[str, str],
+                               index: int, total: int, page_html: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Fetch and convert a single navigation item in a pooled tab.
+        
+        Args:
+            browser: Running PyDoll browser
+            idle_tabs: Pool of idle tabs of the browser
+            item: Navigation item with title and url
+            index: 1-based position of the item, for logging
+            total: Total number of navigation items, for logging
+            page_html: Already fetched HTML for the item, skipping navigation
+            
+        Returns:
+            Dictionary with scraped content or None if failed
+        """
+        if page_html is None:
+            logger.info(f"Processing {index}/{total}: {item['title']}")
+            
+            # Small jittered delay so concurrent tabs don't hit the server in lockstep
+            delay = random.uniform(0.5, 1.5) if index > 1 else 0
+            page_html = await self._fetch_page(browser, idle_tabs, item['url'], delay=delay)
+        else:
+            logger.info(f"Processing {index}/{total}: {item['title']} (already fetched)")
+                
+        if not page_html:
+            logger.warning(f"Failed to fetch: {item['title']}")
+            return None
+            
+        # Convert to markdown off the event loop so other tabs keep talking to the browser
+        result = await self._convert_page(page_html, item['url'])
+        if not result['success']:
+            logger.warning(f"Failed to convert: {item['title']}")
+            return None
+            
+        return {
+            'url': item['url'],
+            'title': result['title'] or item['title'],
+            'content': result['content']
+        }
+        
     async def scrape_library(self, url: str, save_files: bool = True) -> List[Dict[str, Any]]:
         """
         Scrape an entire DeepWiki library.
@@ -194,7 +555,13 @@ class DeepWikiScraper:
         Returns:
             List of scraped pages
         """
-        deepwiki_url = DeepWikiURL(url)
+        async with self._browser_session() as (browser, idle_tabs):
+            return await self._scrape_library(browser, idle_tabs, url, save_files)
+            
+    async def _scrape_library(self, browser, idle_tabs: list, url: str,
+                              save_files: bool) -> List[Dict[str, Any]]:
+        """Scrape a library using an already opened browser session."""
+        deepwiki_url = parse_deepwiki_url(url)
         
         if not deepwiki_url.is_valid_deepwiki():
             logger.error(f"Invalid DeepWiki URL: {url}")
@@ -205,103 +572,111 @@ class DeepWikiScraper:
         
         scraped_pages = []
         
-        options = ChromiumOptions()
-        if self.headless:
-            options.add_argument("--headless=new")
-            options.add_argument("--no-sandbox")
-            options.add_argument("--disable-dev-shm-usage")
-            options.add_argument("--disable-gpu")
-            options.add_argument("--window-size=1920,1080")
-        async with Chrome(options=options) as browser:
-            try:
-                tab = await browser.start()
+        try:
+            # Get main page content
+            main_html = await self._fetch_page(browser, idle_tabs, url)
+            if not main_html:
+                logger.error(f"Failed to fetch main page: {url}")
+                return []
                 
-                # Get main page content
-                main_html = await self._get_page_content(tab, url)
-                if not main_html:
-                    logger.error(f"Failed to fetch main page: {url}")
-                    return []
+            # Extract navigation items
+            nav_items = await self._extract_navigation_items(main_html, deepwiki_url.get_base_url())
+            
+            # If no navigation found, just process the main page
+            if not nav_items:
+                logger.warning("No navigation items found, processing main page only")
+                result = await self._convert_page(main_html, url)
+                if result['success']:
+                    page_data = {
+                        'url': url,
+                        'title': result['title'] or library_name,
+                        'content': result['content']
+                    }
+                    scraped_pages.append(page_data)
                     
-                # Extract navigation items
-                nav_items = await self._extract_navigation_items(main_html, deepwiki_url.get_base_url())
+                    if save_files:
+                        await self._save_pages_async(scraped_pages, library_name)
+                return scraped_pages
                 
-                # If no navigation found, just process the main page
-                if not nav_items:
-                    logger.warning("No navigation items found, processing main page only")
-                    result = self.converter.convert_page(main_html, url)
-                    if result['success']:
-                        page_data = {
-                            'url': url,
-                            'title': result['title'] or library_name,
-                            'content': result['content']
-                        }
-                        scraped_pages.append(page_data)
-                        
-                        if save_files:
-                            self._save_markdown(
-                                page_data['content'],
-                                page_data['title'],
-                                library_name
-                            )
-                    return scraped_pages
+            # Process navigation items concurrently, each in a pooled tab and
+            # bounded by the scraper's fetch slots. A nav entry pointing back at
+            # the library page reuses main_html.
+            tasks = [
+                asyncio.ensure_future(self._scrape_nav_item(
+                    browser, idle_tabs, item, i, len(nav_items),
+                    main_html if item['url'].rstrip('/') == deepwiki_url.url else None
+                ))
+                for i, item in enumerate(nav_items, 1)
+            ]
+            
+            # Collect and save pages in navigation order as each becomes ready,
+            # so disk writes overlap with the navigations still in flight
+            try:
+                for item, task in zip(nav_items, tasks):
+                    try:
+                        page_data = await task
+                    except Exception as e:
+                        # One failing tab only loses its own page
+                        logger.error(f"Error scraping {item['url']}: {e}")
+                        continue
+                    if not page_data:
+                        continue
+                    scraped_pages.append(page_data)
                     
-                # Process each navigation item
-                for i, item in enumerate(nav_items, 1):
-                    logger.info(f"Processing {i}/{len(nav_items)}: {item['title']}")
+                    if save_files:
+                        await self._save_pages_async([page_data], library_name)
+            finally:
+                for task in tasks:
+                    task.cancel()
                     
-                    # Small delay to avoid overwhelming the server
-                    if i > 1:
-                        await asyncio.sleep(1)
-                        
-                    page_html = await self._get_page_content(tab, item['url'])
-                    if not page_html:
-                        logger.warning(f"Failed to fetch: {item['title']}")
-                        continue
-                        
-                    # Convert to markdown
-                    result = self.converter.convert_page(page_html, item['url'])
-                    if result['success']:
-                        page_data = {
-                            'url': item['url'],
-                            'title': result['title'] or item['title'],
-                            'content': result['content']
-                        }
-                        scraped_pages.append(page_data)
-                        
-                        if save_files:
-                            self._save_markdown(
-                                page_data['content'],
-                                page_data['title'],
-                                library_name
-                            )
-                    else:
-                        logger.warning(f"Failed to convert: {item['title']}")
-                        
-            except Exception as e:
-                logger.error(f"Error scraping library {url}: {e}")
-                
+        except Exception as e:
+            logger.error(f"Error scraping library {url}: {e}")
+            
         logger.info(f"Scraped {len(scraped_pages)} pages from {library_name}")
         return scraped_pages
         
-    async def scrape_multiple_libraries(self, urls: List[str], save_files: bool = True) -> Dict[str, List[Dict[str, Any]]]:
+    async def scrape_multiple_libraries(self, urls: List[str], save_files: bool = True,
+                                        max_concurrent_libraries: int = 2) -> Dict[str, List[Dict[str, Any]]]:
         """
-        Scrape multiple DeepWiki libraries.
+        Scrape multiple DeepWiki libraries concurrently.
+        
+        All libraries share one browser and the scraper's max_concurrency
+        fetch slots, so scraping several at once never opens more than one
+        Chrome or more than max_concurrency tabs.
         
         Args:
             urls: List of DeepWiki library URLs
             save_files: Whether to save markdown files
+            max_concurrent_libraries: Maximum number of libraries scraped at once
             
         Returns:
             Dictionary mapping library names to scraped pages
         """
-        results = {}
-        
+        library_names = []
+        seen_names = {}
         for url in urls:
-            deepwiki_url = DeepWikiURL(url)
-            library_name = deepwiki_url.library_name or f"library_{len(results)}"
+            deepwiki_url = parse_deepwiki_url(url)
+            library_name = deepwiki_url.library_name or f"library_{len(seen_names)}"
+            seen_names[library_name] = None
+            library_names.append(library_name)
             
-            logger.info(f"Starting library: {library_name}")
-            pages = await self.scrape_library(url, save_files)
+        semaphore = asyncio.Semaphore(max(1, max_concurrent_libraries))
+        
+        async with self._browser_session() as (browser, idle_tabs):
+            async def scrape(url: str, library_name: str) -> List[Dict[str, Any]]:
+                async with semaphore:
+                    logger.info(f"Starting library: {library_name}")
+                    return await self._scrape_library(browser, idle_tabs, url, save_files)
+                    
+            all_pages = await asyncio.gather(*[
+                scrape(url, library_name) for url, library_name in zip(urls, library_names)
+            ], return_exceptions=True)
+            
+        results = {}
+        for library_name, pages in zip(library_names, all_pages):
+            if isinstance(pages, BaseException):
+                logger.error(f"Error scraping library {library_name}: {pages}")
+                pages = []
             results[library_name] = pages
             
         return results
\ No newline at end of file
@@ -1,17 +1,71 @@
 """SVG flowchart to D2 diagram converter using OpenAI-compatible LLM API."""
 
+import hashlib
 import os
 import logging
 import re
 import subprocess
-import tempfile
-from typing import Optional, Dict, Any
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Optional, Dict, Any, List
 from pathlib import Path
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .utils import PageCache, json_dumps, json_loads
 
 logger = logging.getLogger(__name__)
 
+# Fenced code block in an LLM response, optionally tagged as d2
+_D2_BLOCK_RE = re.compile(r'```(?:d2)?\n(.*?)\n```', re.DOTALL)
+
+# Lines of simple D2 source, matched across the whole text at once. Comment
+# lines are skipped; a connection holds exactly one arrow, and a node
+# definition is any other line with a colon, split at the first one.
+_D2_CONNECTION_RE = re.compile(
+    r'^(?![^\S\n]*#)[^\S\n]*((?:(?!->)[^\n])*?)[^\S\n]*->[^\S\n]*((?:(?!->)[^\n])*?)[^\S\n]*$',
+    re.MULTILINE)
+_D2_NODE_RE = re.compile(
+    r'^(?![^\S\n]*#)(?![^\n]*->)[^\S\n]*([^:\n]*?)[^\S\n]*:[^\S\n]*([^\n]*?)[^\S\n]*$',
+    re.MULTILINE)
+
+# Markup irrelevant to a flowchart's structure, dropped from oversized SVGs
+_SVG_COMMENT_RE = re.compile(r'<!--.*?-->', re.DOTALL)
+_SVG_STYLE_ELEMENT_RE = re.compile(r'<style\b[^>]*>.*?</style>', re.DOTALL | re.IGNORECASE)
+_SVG_PRESENTATION_ATTR_RE = re.compile(r'\s(?:style|font-[\w-]+|stroke(?:-[\w-]+)?)="[^"]*"')
+_SVG_DEFS_RE = re.compile(r'<defs\b[^>]*>.*?</defs>', re.DOTALL | re.IGNORECASE)
+_SVG_INTER_TAG_WS_RE = re.compile(r'>\s+<')
+
+
+def _minify_svg(svg_content: str) -> str:
+    """Strip comments, styling and insignificant whitespace from an SVG."""
+    minified = _SVG_COMMENT_RE.sub('', svg_content)
+    minified = _SVG_STYLE_ELEMENT_RE.sub('', minified)
+    minified = _SVG_PRESENTATION_ATTR_RE.sub('', minified)
+    # Definitions such as arrowhead markers only matter when referenced
+    if 'url(#' not in minified:
+        minified = _SVG_DEFS_RE.sub('', minified)
+    return _SVG_INTER_TAG_WS_RE.sub('><', minified)
+
+
+# D2 renders are CPU bound, so at most one runs per core across all
+# converters and batches in the process
+_D2_SLOTS = threading.BoundedSemaphore(os.cpu_count() or 1)
+
+
+@lru_cache(maxsize=1)
+def _d2_available() -> bool:
+    """Check once per process whether the D2 command is available."""
+    try:
+        # Only the exit status matters, so the output is discarded unbuffered
+        subprocess.run(["d2", "--version"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                       check=True, timeout=5)
+        return True
+    except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
+        return False
+
 
 class SVGToD2Converter:
     """Converts SVG flowcharts to ASCII diagrams using LLM and D2."""
@@ -88,7 +142,12 @@ Remember: Keep it simple. The most basic D2 syntax works best for ASCII renderin
 
 Now convert this SVG flowchart to D2 syntax:"""
     
-    def __init__(self, api_base_url: str = None, api_key: str = None, model: str = "gpt-4o-mini"):
+    BATCH_PROMPT = """There are {count} separate SVG flowcharts below instead of one. Convert each of them on its own and
+answer with exactly {count} ```d2 code blocks, one per flowchart, in the order given."""
+    
+    def __init__(self, api_base_url: str = None, api_key: str = None, model: str = "gpt-4o-mini",
+                 max_concurrency: int = 4, session: Optional[requests.Session] = None,
+                 cache_dir: Optional[str] = None, batch_size: int = 4, max_svg_chars: int = 60000):
         """
         Initialize SVG to D2 converter.
         
@@ -96,58 +155,166 @@ Now convert this SVG flowchart to D2 syntax:"""
             api_base_url: OpenAI-compatible API base URL (e.g., http://localhost:1234/v1)
             api_key: API key (can be dummy for local APIs)
             model: Model name to use
+            max_concurrency: Maximum number of flowcharts of one page converted at once
+            session: Session for API requests; one with retries and keep-alive is built if omitted
+            cache_dir: Directory for caching converted diagrams (defaults to $DEEPWIKI_SVG_CACHE,
+                disabled if neither is set)
+            batch_size: Number of flowcharts packed into one LLM request by convert_many
+            max_svg_chars: Size above which an SVG is minified, and rejected if still larger
         """
         self.api_base_url = api_base_url or os.getenv("OPENAI_API_BASE", "https://api.openai.com/v1")
         self.api_key = api_key or os.getenv("OPENAI_API_KEY", "dummy-key")
         self.model = model
+        self.max_concurrency = max(1, max_concurrency)
+        self.batch_size = max(1, batch_size)
+        self.max_svg_chars = max_svg_chars
+        self.session = session or self._create_session()
+        
+        # Converted diagrams keyed by SVG content, model and prompt; an
+        # unchanged diagram never goes back to the LLM
+        cache_dir = cache_dir or os.getenv("DEEPWIKI_SVG_CACHE")
+        self.result_cache = PageCache(cache_dir, ttl=None) if cache_dir else None
+        self._results: Dict[str, Dict[str, str]] = {}
+        self._key_prefix = None
         
         # Check if D2 is available
         self.d2_available = self._check_d2_available()
         if not self.d2_available:
             logger.warning("D2 is not available. SVG conversion will return D2 code only.")
     
+    def _create_session(self) -> requests.Session:
+        """Create a keep-alive session that retries rate limits and transient server errors."""
+        session = requests.Session()
+        # POST is not retried by default; a completion request has no side effects.
+        # Rate-limited responses wait out their Retry-After header, and the final
+        # failed response is returned so _request_completion can log it
+        retry = Retry(total=5, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=frozenset({'POST'}), respect_retry_after_header=True,
+                      raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=self.max_concurrency, pool_maxsize=self.max_concurrency,
+                              max_retries=retry)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+    
+    def _cache_key(self, svg_content: str) -> str:
+        """Get the cache key for converting an SVG with the current model and prompt."""
+        # The model and prompt are hashed once; each SVG only extends a copy
+        # of that state instead of rehashing the 2 KB prompt
+        if self._key_prefix is None or self._key_prefix[0] != self.model:
+            hasher = hashlib.blake2b(f"{self.model}\0{self.SVG_TO_D2_PROMPT}\0".encode('utf-8'),
+                                     digest_size=16)
+            self._key_prefix = (self.model, hasher)
+        hasher = self._key_prefix[1].copy()
+        hasher.update(svg_content.encode('utf-8'))
+        return f"svg:{hasher.hexdigest()}"
+    
+    def _get_cached_result(self, key: str) -> Optional[Dict[str, str]]:
+        """Look up a converted diagram in memory, then on disk."""
+        cached = self._results.get(key)
+        if cached is None and self.result_cache:
+            cached_json = self.result_cache.get(key)
+            if cached_json is not None:
+                try:
+                    cached = json_loads(cached_json)
+                except ValueError:
+                    # A damaged entry is just a miss; the diagram is converted again
+                    logger.warning(f"Ignoring unreadable cached SVG conversion {key}")
+                    return None
+                self._results[key] = cached
+        return cached
+    
+    def _set_cached_result(self, key: str, d2_code: str, ascii_diagram: str) -> None:
+        """Remember a converted diagram in memory and, if configured, on disk."""
+        cached = {'d2_code': d2_code, 'ascii_diagram': ascii_diagram}
+        self._results[key] = cached
+        if self.result_cache:
+            self.result_cache.set(key, json_dumps(cached))
+    
+    def _prepare_svg(self, svg_content: str) -> Optional[str]:
+        """Minify an oversized SVG for the prompt, or return None if it is still too large."""
+        if len(svg_content) <= self.max_svg_chars:
+            return svg_content
+        minified = _minify_svg(svg_content)
+        logger.info(f"Minified oversized SVG from {len(svg_content)} to {len(minified)} chars")
+        if len(minified) > self.max_svg_chars:
+            logger.warning(f"SVG of {len(minified)} chars exceeds the {self.max_svg_chars} char limit")
+            return None
+        return minified
+    
+    def _size_limit_result(self) -> Dict[str, Any]:
+        """Get the failed conversion result for an SVG too large to send."""
+        return {
+            'success': False,
+            'd2_code': '',
+            'ascii_diagram': '',
+            'error': f"SVG exceeds size limit of {self.max_svg_chars} chars"
+        }
+    
     def _check_d2_available(self) -> bool:
         """Check if D2 command is available."""
-        try:
-            subprocess.run(["d2", "--version"], capture_output=True, check=True, timeout=5)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
-            return False
+        return _d2_available()
     
     def _call_llm_api(self, svg_content: str) -> Optional[str]:
         """Call the LLM API to convert SVG to D2."""
+        # Log the request details (excluding full SVG content for brevity)
+        svg_preview = svg_content[:200] + "..." if len(svg_content) > 200 else svg_content
+        logger.debug(f"LLM API Request - SVG Content Preview: {svg_preview}")
+        logger.debug(f"LLM API Request - SVG Content Length: {len(svg_content)} chars")
+        
+        return self._request_completion(f"```svg\n{svg_content}\n```")
+    
+    def _call_llm_api_batch(self, svg_contents: List[str]) -> Optional[str]:
+        """Call the LLM API once to convert several SVGs to D2."""
+        logger.debug(f"LLM API Request - Batch of {len(svg_contents)} SVGs, "
+                     f"{sum(len(svg) for svg in svg_contents)} chars")
+        
+        sections = [f"## SVG {i}\n```svg\n{svg}\n```" for i, svg in enumerate(svg_contents, 1)]
+        message = self.BATCH_PROMPT.format(count=len(svg_contents)) + "\n\n" + "\n\n".join(sections)
+        return self._request_completion(message, max_tokens=2000 * len(svg_contents))
+    
+    def _request_completion(self, message: str, max_tokens: int = 2000) -> Optional[str]:
+        """
+        Send one user message to the chat completions endpoint and return the reply.
+        
+        The conversion prompt goes first as a separate system message, so every
+        request starts with the same prefix and providers with prompt caching
+        only process it once.
+        """
         try:
             headers = {
                 "Content-Type": "application/json",
                 "Authorization": f"Bearer {self.api_key}"
             }
             
-            # Log the request details (excluding full SVG content for brevity)
-            svg_preview = svg_content[:200] + "..." if len(svg_content) > 200 else svg_content
             logger.debug(f"LLM API Request - URL: {self.api_base_url}/chat/completions")
             logger.debug(f"LLM API Request - Model: {self.model}")
-            logger.debug(f"LLM API Request - SVG Content Preview: {svg_preview}")
-            logger.debug(f"LLM API Request - SVG Content Length: {len(svg_content)} chars")
             
             payload = {
                 "model": self.model,
                 "messages": [
+                    {
+                        "role": "system",
+                        "content": self.SVG_TO_D2_PROMPT
+                    },
                     {
                         "role": "user",
-                        "content": f"{self.SVG_TO_D2_PROMPT}\n\n```svg\n{svg_content}\n```"
+                        "content": message
                     }
                 ],
                 "temperature": 0.1,
-                "max_tokens": 2000
+                "max_tokens": max_tokens
             }
             
-            logger.debug(f"LLM API Request - Payload size: {len(json.dumps(payload))} chars")
+            # Serialized once, both for the size log and the request body
+            body = json_dumps(payload)
+            logger.debug(f"LLM API Request - Payload size: {len(body)} bytes")
             logger.info("Sending request to LLM API...")
             
-            response = requests.post(
+            response = self.session.post(
                 f"{self.api_base_url}/chat/completions",
                 headers=headers,
-                json=payload,
+                data=body,
                 timeout=30
             )
             
@@ -155,7 +322,7 @@ Now convert this SVG flowchart to D2 syntax:"""
             logger.debug(f"LLM API Response - Headers: {dict(response.headers)}")
             
             if response.status_code == 200:
-                result = response.json()
+                result = json_loads(response.content)
                 
                 # Log response details
                 response_content = result["choices"][0]["message"]["content"]
@@ -179,8 +346,7 @@ Now convert this SVG flowchart to D2 syntax:"""
         except Exception as e:
             logger.error(f"Error calling LLM API: {e}")
             logger.debug(f"Exception type: {type(e).__name__}")
-            import traceback
-            logger.debug(f"Full traceback: {traceback.format_exc()}")
+            logger.debug("Full traceback:", exc_info=True)
             return None
     
     def _extract_d2_code(self, llm_response: str) -> Optional[str]:
@@ -195,13 +361,12 @@ Now convert this SVG flowchart to D2 syntax:"""
         logger.debug(f"LLM response preview (first 500 chars): {llm_response[:500]}")
         
         # Look for D2 code blocks
-        d2_pattern = r'```(?:d2)?\n(.*?)\n```'
-        matches = re.findall(d2_pattern, llm_response, re.DOTALL)
+        matches = self._extract_d2_blocks(llm_response)
         
-        logger.debug(f"Found {len(matches)} code block matches using pattern: {d2_pattern}")
+        logger.debug(f"Found {len(matches)} code block matches using pattern: {_D2_BLOCK_RE.pattern}")
         
         if matches:
-            extracted_d2 = matches[0].strip()
+            extracted_d2 = matches[0]
             logger.debug(f"Extracted D2 code from first match (length: {len(extracted_d2)} chars):")
             logger.debug(f"D2 Code:\n{extracted_d2}")
             return extracted_d2
@@ -215,14 +380,13 @@ Now convert this SVG flowchart to D2 syntax:"""
         
         logger.debug(f"Processing {len(lines)} lines for D2 content")
         
-        for i, line in enumerate(lines):
+        # Per-line logging is left out of the scan; f-strings are formatted
+        # even when DEBUG is off
+        for line in lines:
             if ':' in line and not line.startswith('#') and not line.startswith('**'):
-                if not in_d2:
-                    logger.debug(f"Found potential D2 content start at line {i}: {line}")
                 in_d2 = True
             if in_d2:
                 d2_lines.append(line)
-                logger.debug(f"Added line {i} to D2 content: {line}")
         
         result = '\n'.join(d2_lines).strip() if d2_lines else None
         
@@ -234,6 +398,24 @@ Now convert this SVG flowchart to D2 syntax:"""
         
         return result
     
+    @staticmethod
+    def _extract_d2_blocks(llm_response: str) -> List[str]:
+        """Extract every fenced D2 code block from an LLM response, in order."""
+        return [block.strip() for block in _D2_BLOCK_RE.findall(llm_response)]
+    
+    def _render_d2(self, d2_code: str) -> str:
+        """Render D2 code as an ASCII diagram, with the simple renderer as fallback."""
+        logger.info("Step 3: Converting D2 to ASCII diagram...")
+        ascii_diagram = self._d2_to_ascii(d2_code)
+        if ascii_diagram:
+            logger.info("Step 3 SUCCESS: D2 conversion successful")
+            return ascii_diagram
+        logger.info("Step 3 FALLBACK: Using simple ASCII conversion")
+        # Fallback to simple ASCII representation
+        ascii_diagram = self._simple_d2_to_ascii(d2_code)
+        logger.info("Step 3 SUCCESS: Fallback ASCII conversion completed")
+        return ascii_diagram
+    
     def _d2_to_ascii(self, d2_content: str) -> Optional[str]:
         """Convert D2 content to ASCII using the D2 command."""
         logger.debug("Starting D2 to ASCII conversion")
@@ -245,27 +427,18 @@ Now convert this SVG flowchart to D2 syntax:"""
             return None
             
         try:
-            # Create temporary files
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.d2', delete=False) as d2_file:
-                d2_file.write(d2_content)
-                d2_file_path = d2_file.name
-            
-            logger.debug(f"Created temporary D2 file: {d2_file_path}")
-            
-            with tempfile.NamedTemporaryFile(suffix='.svg', delete=False) as svg_file:
-                svg_file_path = svg_file.name
-            
-            logger.debug(f"Created temporary SVG file: {svg_file_path}")
-            
             # Convert D2 to SVG first, then we could convert to ASCII
-            # For now, let's use a simple ASCII art approach
-            cmd = ["d2", "--sketch", d2_file_path, svg_file_path]
+            # For now, let's use a simple ASCII art approach.
+            # The source is piped through stdin and the SVG read from stdout,
+            # so no temporary files are needed
+            cmd = ["d2", "--sketch", "-", "-"]
             logger.debug(f"Running D2 command: {' '.join(cmd)}")
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            with _D2_SLOTS:
+                result = subprocess.run(cmd, input=d2_content, capture_output=True, text=True, timeout=30)
             
             logger.debug(f"D2 command return code: {result.returncode}")
-            logger.debug(f"D2 command stdout: {result.stdout}")
+            logger.debug(f"D2 command output length: {len(result.stdout)} chars")
             if result.stderr:
                 logger.debug(f"D2 command stderr: {result.stderr}")
             
@@ -285,62 +458,25 @@ Now convert this SVG flowchart to D2 syntax:"""
             return None
         except Exception as e:
             logger.error(f"Error converting D2 to ASCII: {e}")
-            import traceback
-            logger.debug(f"Full traceback: {traceback.format_exc()}")
+            logger.debug("Full traceback:", exc_info=True)
             return None
-        finally:
-            # Clean up temp files
-            try:
-                if 'd2_file_path' in locals():
-                    logger.debug(f"Cleaning up temporary D2 file: {d2_file_path}")
-                    os.unlink(d2_file_path)
-                if 'svg_file_path' in locals():
-                    logger.debug(f"Cleaning up temporary SVG file: {svg_file_path}")
-                    os.unlink(svg_file_path)
-            except Exception as cleanup_error:
-                logger.warning(f"Error cleaning up temporary files: {cleanup_error}")
     
     def _simple_d2_to_ascii(self, d2_content: str) -> str:
         """Simple D2 to ASCII conversion for basic diagrams."""
         logger.debug("Starting simple D2 to ASCII conversion")
         logger.debug(f"Input D2 content:\n{d2_content}")
         
-        lines = d2_content.split('\n')
-        nodes = {}
-        connections = []
-        
-        logger.debug(f"Processing {len(lines)} lines from D2 content")
+        connections = _D2_CONNECTION_RE.findall(d2_content)
+        nodes = dict(_D2_NODE_RE.findall(d2_content))
         
-        for i, line in enumerate(lines):
-            line = line.strip()
-            logger.debug(f"Processing line {i}: '{line}'")
-            
-            if not line or line.startswith('#'):
-                logger.debug(f"Skipping empty or comment line {i}")
-                continue
-                
-            if '->' in line:
-                # Connection
-                parts = line.split('->')
-                if len(parts) == 2:
-                    connection = (parts[0].strip(), parts[1].strip())
-                    connections.append(connection)
-                    logger.debug(f"Found connection: {connection[0]} -> {connection[1]}")
-                else:
+        # Only lines chaining several arrows are left unmatched; find them
+        # for the warning when the arrow count says there are any
+        if d2_content.count('->') > len(connections):
+            for i, line in enumerate(d2_content.split('\n')):
+                line = line.strip()
+                if line.count('->') > 1 and not line.startswith('#'):
                     logger.warning(f"Invalid connection format on line {i}: {line}")
-            elif ':' in line:
-                # Node definition
-                parts = line.split(':', 1)
-                if len(parts) == 2:
-                    node_name = parts[0].strip()
-                    node_desc = parts[1].strip()
-                    nodes[node_name] = node_desc
-                    logger.debug(f"Found node: '{node_name}' = '{node_desc}'")
-                else:
-                    logger.warning(f"Invalid node format on line {i}: {line}")
-            else:
-                logger.debug(f"Skipping unrecognized line format {i}: {line}")
-        
+                    
         logger.debug(f"Parsed {len(nodes)} nodes and {len(connections)} connections")
         logger.debug(f"Nodes: {list(nodes.keys())}")
         logger.debug(f"Connections: {connections}")
@@ -356,14 +492,12 @@ Now convert this SVG flowchart to D2 syntax:"""
             ascii_lines.append(f"│ {truncated_desc} │")
             ascii_lines.append("└─────────┘")
             ascii_lines.append("    │")
-            logger.debug(f"Added ASCII box for node: {node_name}")
         
         # Add connections
         if connections:
             ascii_lines.append("    ▼")
             for src, dest in connections:
                 ascii_lines.append(f"{src} --> {dest}")
-                logger.debug(f"Added ASCII connection: {src} --> {dest}")
         else:
             logger.debug("No connections to add")
         
@@ -392,6 +526,18 @@ Now convert this SVG flowchart to D2 syntax:"""
         logger.debug(f"SVG content length: {len(svg_content)} chars")
         logger.debug(f"SVG content preview (first 200 chars): {svg_content[:200]}...")
         
+        cache_key = self._cache_key(svg_content)
+        cached = self._get_cached_result(cache_key)
+        if cached is not None:
+            logger.info("Using cached conversion for unchanged SVG")
+            return {'success': True, 'error': '', **cached}
+            
+        # Oversized SVGs would only be truncated by the model, so they are
+        # shrunk first and rejected without an API call if that is not enough
+        prompt_svg = self._prepare_svg(svg_content)
+        if prompt_svg is None:
+            return self._size_limit_result()
+            
         result = {
             'success': False,
             'd2_code': '',
@@ -402,7 +548,7 @@ Now convert this SVG flowchart to D2 syntax:"""
         try:
             # Step 1: Call LLM to convert SVG to D2
             logger.info("Step 1: Converting SVG to D2 using LLM...")
-            llm_response = self._call_llm_api(svg_content)
+            llm_response = self._call_llm_api(prompt_svg)
             
             if not llm_response:
                 error_msg = "Failed to get response from LLM API"
@@ -426,27 +572,115 @@ Now convert this SVG flowchart to D2 syntax:"""
             result['d2_code'] = d2_code
             
             # Step 3: Convert D2 to ASCII
-            logger.info("Step 3: Converting D2 to ASCII diagram...")
-            ascii_diagram = self._d2_to_ascii(d2_code)
-            if ascii_diagram:
-                logger.info("Step 3 SUCCESS: D2 conversion successful")
-                result['ascii_diagram'] = ascii_diagram
-                result['success'] = True
-            else:
-                logger.info("Step 3 FALLBACK: Using simple ASCII conversion")
-                # Fallback to simple ASCII representation
-                result['ascii_diagram'] = self._simple_d2_to_ascii(d2_code)
-                result['success'] = True
-                logger.info("Step 3 SUCCESS: Fallback ASCII conversion completed")
+            result['ascii_diagram'] = self._render_d2(d2_code)
+            result['success'] = True
             
+            self._set_cached_result(cache_key, result['d2_code'], result['ascii_diagram'])
             logger.info("=== SVG to ASCII conversion completed successfully ===")
             logger.debug(f"Final ASCII diagram length: {len(result['ascii_diagram'])} chars")
             
         except Exception as e:
             error_msg = f"Error in SVG to ASCII conversion: {e}"
             logger.error(f"=== CONVERSION FAILED: {error_msg} ===")
-            import traceback
-            logger.debug(f"Full traceback: {traceback.format_exc()}")
+            logger.debug("Full traceback:", exc_info=True)
             result['error'] = str(e)
         
-        return result
\ No newline at end of file
+        return result
+    
+    def convert_many(self, svg_contents: List[str]) -> List[Dict[str, Any]]:
+        """
+        Convert several SVG flowcharts, packing uncached ones into shared LLM requests.
+        
+        Up to batch_size flowcharts go into each request and up to max_concurrency
+        requests run at once. A batch whose response does not hold one D2 block per
+        flowchart is retried one flowchart at a time.
+        
+        Args:
+            svg_contents: Raw SVG contents
+            
+        Returns:
+            One conversion result per SVG, in order, shaped like convert_svg_to_ascii's
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(svg_contents)
+        pending = []
+        for i, svg_content in enumerate(svg_contents):
+            cached = self._get_cached_result(self._cache_key(svg_content))
+            if cached is not None:
+                results[i] = {'success': True, 'error': '', **cached}
+            else:
+                pending.append(i)
+                
+        prompt_svgs = {}
+        for i in pending:
+            prompt_svg = self._prepare_svg(svg_contents[i])
+            if prompt_svg is None:
+                results[i] = self._size_limit_result()
+            else:
+                prompt_svgs[i] = prompt_svg
+        pending = list(prompt_svgs)
+        
+        batches = [pending[i:i + self.batch_size] for i in range(0, len(pending), self.batch_size)]
+        logger.info(f"Converting {len(pending)} of {len(svg_contents)} SVGs in {len(batches)} LLM requests")
+        
+        def convert_batch(batch: List[int]) -> None:
+            try:
+                batch_results = self._convert_batch([svg_contents[i] for i in batch],
+                                                    [prompt_svgs[i] for i in batch])
+            except Exception as e:
+                logger.error(f"Error converting a batch of {len(batch)} SVGs: {e}")
+                return
+            for i, result in zip(batch, batch_results):
+                results[i] = result
+                
+        if len(batches) > 1 and self.max_concurrency > 1:
+            with ThreadPoolExecutor(max_workers=min(len(batches), self.max_concurrency)) as pool:
+                list(pool.map(convert_batch, batches))
+        else:
+            for batch in batches:
+                convert_batch(batch)
+                
+        # A batch that failed outright only costs its own SVGs one request each,
+        # instead of the whole page losing its diagrams
+        for i in pending:
+            if results[i] is None:
+                results[i] = self._convert_single(svg_contents[i])
+                
+        return results
+    
+    def _convert_single(self, svg_content: str) -> Dict[str, Any]:
+        """Convert one SVG with convert_svg_to_ascii, turning any error into a failed result."""
+        try:
+            return self.convert_svg_to_ascii(svg_content)
+        except Exception as e:
+            logger.error(f"Error converting SVG: {e}")
+            return {'success': False, 'd2_code': '', 'ascii_diagram': '', 'error': str(e)}
+    
+    def _convert_batch(self, svg_contents: List[str], prompt_svgs: List[str]) -> List[Dict[str, Any]]:
+        """Convert a batch of uncached SVGs with one LLM request, falling back to one request each."""
+        if len(svg_contents) == 1:
+            return [self._convert_single(svg_contents[0])]
+            
+        try:
+            llm_response = self._call_llm_api_batch(prompt_svgs)
+            d2_blocks = self._extract_d2_blocks(llm_response) if llm_response else []
+            if len(d2_blocks) == len(svg_contents):
+                # Render the batch's diagrams in parallel D2 processes
+                with ThreadPoolExecutor(max_workers=len(d2_blocks)) as pool:
+                    ascii_diagrams = list(pool.map(self._render_d2, d2_blocks))
+                    
+                results = []
+                for svg_content, d2_code, ascii_diagram in zip(svg_contents, d2_blocks, ascii_diagrams):
+                    self._set_cached_result(self._cache_key(svg_content), d2_code, ascii_diagram)
+                    results.append({
+                        'success': True,
+                        'd2_code': d2_code,
+                        'ascii_diagram': ascii_diagram,
+                        'error': ''
+                    })
+                return results
+            logger.warning(f"Batched LLM response held {len(d2_blocks)} D2 blocks for "
+                           f"{len(svg_contents)} SVGs, converting them one at a time")
+        except Exception as e:
+            logger.error(f"Error in batched SVG conversion: {e}, converting one at a time")
+            
+        return [self._convert_single(svg_content) for svg_content in svg_contents]
\ No newline at end of file
@@ -1,20 +1,201 @@
 """Utility functions and classes for deepwiki2md package."""
 
+import gzip
+import hashlib
+import json
+import os
 import re
-from urllib.parse import urlparse, urljoin
-from typing import Optional, List, Dict, Any
+import tempfile
+import time
+from functools import lru_cache
+from urllib.parse import urlsplit, urljoin
+from typing import Optional, List, Dict, Any, Tuple, Iterable, Iterator, Union
 from pathlib import Path
 import logging
 
+import requests
+import soupsieve
+from bs4 import BeautifulSoup, SoupStrainer
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 logger = logging.getLogger(__name__)
 
+# Use the C-backed lxml tree builder, falling back to the stdlib parser when
+# the package is run from a source checkout without lxml installed
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# Cached conversions and LLM requests carry whole pages and SVGs, so JSON goes
+# through orjson when it is installed, falling back to the stdlib encoder
+try:
+    import orjson
+    
+    def json_dumps(obj: Any) -> bytes:
+        """Serialize an object to UTF-8 encoded JSON."""
+        return orjson.dumps(obj)
+    
+    json_loads = orjson.loads
+except ImportError:
+    def json_dumps(obj: Any) -> bytes:
+        """Serialize an object to UTF-8 encoded JSON."""
+        return json.dumps(obj).encode('utf-8')
+    
+    json_loads = json.loads
+
+# Built once and shared by every FileUtils.sanitize_filename call; deleting
+# characters through a translate table is a single C-level pass
+_INVALID_FILENAME_CHARS = str.maketrans('', '', '\\/*?:"<>|')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Markdown links with URLs, reduced to their text by clean_markdown_links
+_MARKDOWN_LINK_RE = re.compile(r'\[([^\]]+)\]\((?![s\)])[^\)]+\)')
+
+# Promotional and navigation lines dropped by remove_deepwiki_chrome
+_CHROME_LINE_PATTERNS = (
+    # Promotional links
+    r'^\[Get free private DeepWikis.*\]\(\)$',
+    r'^\[.*DeepWiki.*\]\(\)$',
+    r'^\[.*Devin.*\]\(\).*Share$',
+    # Empty promotional links like [DeepWiki]() (DeepWiki itself is matched above)
+    r'^\[.*(?:Devin|Private).*\]\(\)$',
+    # Navigation elements
+    r'^Menu$',
+    r'^Share$',
+    r'^Dismiss$',
+    r'^Refresh this wiki$',
+    r'^Enter email to refresh$',
+    r'^Ask Devin about.*$',
+    r'^Deep Research$',
+    # Combined navigation text
+    r'^DismissEnter email to refresh$',
+    r'^.*Dismiss.*refresh.*$',
+    # Metadata
+    r'^Last indexed:.*\(\)$',
+    r'^Last indexed:.*$',
+    # Table of contents at bottom
+    r'^### On this page$',
+    r'^Ask.*about.*$'
+)
+# One alternation tests a line against every pattern in a single match call
+_CHROME_LINE_RE = re.compile('|'.join(f'(?:{pattern})' for pattern in _CHROME_LINE_PATTERNS),
+                             re.IGNORECASE)
+
+# Every line filter_css_mermaid_content drops contains one of these
+_CSS_MERMAID_MARKERS = ('#mermaid-', 'font-family:ui-sans-serif', '@keyframes', 'stroke-dasharray')
+
+# Mermaid flowcharts handed to the SVG converter, and the placeholders
+# standing in for them until the converted diagrams are inserted
+_SVG_FLOWCHART_RE = re.compile(r'<svg[^>]*aria-roledescription="flowchart[^"]*"[^>]*>.*?</svg>',
+                               re.DOTALL | re.IGNORECASE)
+_SVG_PLACEHOLDER_RE = re.compile(r'<!-- SVG_PLACEHOLDER_\d+ -->')
+
+# Selectors for the sidebar list holding a library's page links, tried in order
+NAV_LIST_SELECTORS = (
+    'ul.flex-1.flex-shrink-0.space-y-1.overflow-y-auto.py-1',
+    'nav ul',
+    '.navigation ul',
+    '.sidebar ul',
+    '.menu ul',
+    'ul[class*="nav"]',
+    'ul[class*="menu"]',
+)
+
+# Navigation chrome removed before markdown conversion
+_NAV_ELEMENT_SELECTORS = (
+    'ul.flex-1.flex-shrink-0.space-y-1.overflow-y-auto.py-1',
+    'nav',
+    '.navigation',
+    '.sidebar',
+    '.menu',
+    '.header-nav',
+    '.footer',
+    '.page-nav',
+    '.breadcrumb',
+)
+
+# Text identifying DeepWiki promotional elements
+_PROMOTIONAL_TEXTS = (
+    'Get free private DeepWikis',
+    'Ask Devin about',
+    'Deep Research',
+    'Last indexed',
+    'Refresh this wiki',
+)
+
+# One pattern finds every promotional string in a single pass over the tree
+_PROMOTIONAL_TEXT_RE = re.compile('|'.join(re.escape(text) for text in _PROMOTIONAL_TEXTS))
+
+_TITLE_SELECTORS = ('h1', 'title', '.page-title', '.article-title')
+
+# The first <h1> normally closes near the top of the page, so extract_title_from_content
+# parses only up to there before falling back to parsing the whole document. Headings
+# holding another <h1>, a comment or a raw-text element always take the full parse.
+_H1_START_RE = re.compile(r'<h1[\s>]', re.IGNORECASE)
+_H1_END_RE = re.compile(r'</h1\s*>', re.IGNORECASE)
+_H1_UNSAFE_CONTENT_RE = re.compile(r'<(?:h1[\s>]|!--|script|style|textarea|title)', re.IGNORECASE)
+_TITLE_PROBE_CHARS = 64 * 1024
+
+# Every navigation selector targets a list, so pages without one are rejected unparsed
+_LIST_TAG_RE = re.compile(r'<ul[\s>]', re.IGNORECASE)
+
+# Selector lists compiled once at import, instead of on every select call
+_NAV_LIST_PATTERNS = tuple((selector, soupsieve.compile(selector)) for selector in NAV_LIST_SELECTORS)
+# All navigation chrome is matched as one selector list, in a single tree walk
+_NAV_ELEMENT_PATTERN = soupsieve.compile(', '.join(_NAV_ELEMENT_SELECTORS))
+_TITLE_PATTERNS = tuple(soupsieve.compile(selector) for selector in _TITLE_SELECTORS)
+
+# Browser-like User-Agent sent with plain HTTP requests
+USER_AGENT = 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+
+@lru_cache(maxsize=None)
+def get_http_session(pool_size: int) -> requests.Session:
+    """
+    Get the process-wide session for a connection pool size.
+    
+    Sharing one session lets every scraper instance reuse warm keep-alive
+    connections to deepwiki.com instead of paying a new TLS handshake each time.
+    """
+    session = requests.Session()
+    session.headers.update({'User-Agent': USER_AGENT})
+    # Transient failures are retried with backoff; the final response is still
+    # checked by raise_for_status in the caller
+    retry = Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504),
+                  raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
 
 class DeepWikiURL:
     """Utility class for handling DeepWiki URLs."""
     
+    # The URL is fixed at construction, so every derived part is computed
+    # once in __init__ and held in a slot instead of a per-instance __dict__
+    __slots__ = ('url', 'parsed', '_path_parts', '_library_name', '_is_valid_deepwiki', '_base_url')
+    
     def __init__(self, url: str):
         self.url = url.rstrip('/')
-        self.parsed = urlparse(self.url)
+        # urlsplit skips urlparse's search for ;params, which DeepWiki URLs never use
+        self.parsed = urlsplit(self.url)
+        
+        # Kept immutable: parse_deepwiki_url shares one instance per URL string
+        parts = tuple(part for part in self.parsed.path.strip('/').split('/') if part)
+        self._path_parts = parts
+        if len(parts) >= 2:
+            self._library_name = parts[1]  # Usually the second part after domain/project
+        else:
+            self._library_name = parts[0] if parts else None
+        
+        domain = self.parsed.netloc
+        # An empty domain cannot contain 'deepwiki', so it needs no check of its own
+        self._is_valid_deepwiki = bool(parts) and 'deepwiki' in domain.lower()
+        self._base_url = f"{self.parsed.scheme}://{domain}"
         
     @property
     def domain(self) -> str:
@@ -24,43 +205,123 @@ class DeepWikiURL:
     @property
     def path_parts(self) -> List[str]:
         """Get URL path parts as a list."""
-        return [part for part in self.parsed.path.strip('/').split('/') if part]
+        # A fresh list each time, so callers can't change the shared parts
+        return list(self._path_parts)
         
     @property
     def library_name(self) -> Optional[str]:
         """Extract library name from URL path."""
-        parts = self.path_parts
-        if len(parts) >= 2:
-            return parts[1]  # Usually the second part after domain/project
-        return parts[0] if parts else None
+        return self._library_name
         
     def is_valid_deepwiki(self) -> bool:
         """Check if this appears to be a valid DeepWiki URL."""
-        return (
-            bool(self.domain) and 
-            'deepwiki' in self.domain.lower() and
-            len(self.path_parts) >= 1
-        )
+        return self._is_valid_deepwiki
         
     def get_base_url(self) -> str:
         """Get the base URL for this DeepWiki site."""
-        return f"{self.parsed.scheme}://{self.parsed.netloc}"
+        return self._base_url
+        
+    @staticmethod
+    def resolve_href(base_url: str, href: str) -> str:
+        """Resolve a link against a scheme://netloc base URL."""
+        # Root-relative and absolute links without dot segments (the common cases
+        # in DeepWiki navigation) need no more than concatenation, skipping
+        # urljoin's parsing of both URLs
+        if '/.' not in href:
+            if href.startswith('/') and not href.startswith('//'):
+                return base_url + href
+            if href.startswith(('https://', 'http://')):
+                return href
+        return urljoin(base_url, href)
+
+
+@lru_cache(maxsize=1024)
+def parse_deepwiki_url(url: str) -> DeepWikiURL:
+    """Get a shared DeepWikiURL for url, parsing each distinct URL only once."""
+    return DeepWikiURL(url)
+
+
+def extract_navigation_items(html_content, base_url: str) -> List[Dict[str, str]]:
+    """
+    Extract a library's navigation items from page HTML.
+    
+    Args:
+        html_content: HTML content to parse, or an already parsed BeautifulSoup document
+        base_url: Base URL for resolving relative links
+        
+    Returns:
+        List of navigation items with title and url, unique by url
+    """
+    if not html_content:
+        return []
+        
+    # Keyed by URL so repeated links are dropped while keeping first-seen order
+    nav_items = {}
+    
+    if isinstance(html_content, BeautifulSoup):
+        # An already built tree is searched with every selector directly
+        soup = html_content
+        patterns = _NAV_LIST_PATTERNS
+    elif not _LIST_TAG_RE.search(html_content):
+        logger.info("Found 0 navigation items")
+        return []
+    elif 'flex-1' not in html_content:
+        # No sidebar class anywhere, so the strainer pass below could not match
+        soup = BeautifulSoup(html_content, HTML_PARSER)
+        patterns = _NAV_LIST_PATTERNS
+    else:
+        # Cheap pass building only the subtrees of lists carrying the sidebar's
+        # flex-1 class, skipping every list in the page content; the full tree is
+        # only built when the ancestor-dependent selectors are needed
+        strainer = SoupStrainer('ul', class_=lambda c: c is not None and 'flex-1' in c)
+        soup = BeautifulSoup(html_content, HTML_PARSER, parse_only=strainer)
+        patterns = _NAV_LIST_PATTERNS[:1]
+        if not patterns[0][1].select_one(soup):
+            soup = BeautifulSoup(html_content, HTML_PARSER)
+            patterns = _NAV_LIST_PATTERNS[1:]
+    
+    # Try different selectors for navigation
+    for selector, pattern in patterns:
+        nav_ul = pattern.select_one(soup)
+        if nav_ul:
+            logger.debug(f"Found navigation using selector: {selector}")
+            
+            for li in nav_ul.find_all('li'):
+                a_tag = li.find('a')
+                if a_tag and a_tag.get('href'):
+                    title = a_tag.get_text(strip=True)
+                    href = a_tag.get('href')
+                    # Fragments and trailing slashes point at the same page,
+                    # so they are dropped to fetch each page only once
+                    full_url = DeepWikiURL.resolve_href(base_url, href).split('#', 1)[0].rstrip('/')
+                    
+                    if title and full_url:
+                        nav_items.setdefault(full_url, {
+                            'title': title,
+                            'url': full_url
+                        })
+                        
+            break  # Use first successful selector
+            
+    logger.info(f"Found {len(nav_items)} navigation items")
+    return list(nav_items.values())
 
 
 class FileUtils:
     """Utility functions for file operations."""
     
     @staticmethod
+    @lru_cache(maxsize=4096)
     def sanitize_filename(name: str) -> str:
         """Sanitize a string to be used as a filename."""
         # Remove or replace invalid characters
-        sanitized = re.sub(r'[\\/*?:"<>|]', '', name)
+        sanitized = name.translate(_INVALID_FILENAME_CHARS)
         # Replace whitespace with underscores
-        sanitized = re.sub(r'\s+', '_', sanitized)
+        sanitized = _WHITESPACE_RE.sub('_', sanitized)
         # Remove leading/trailing dots and spaces
         sanitized = sanitized.strip('. ')
-        # Limit length
-        return sanitized[:200] if len(sanitized) > 200 else sanitized
+        # Limit length (slicing past the end is already a no-op)
+        return sanitized[:200]
     
     @staticmethod
     def ensure_directory(path: Path) -> Path:
@@ -69,6 +330,92 @@ class FileUtils:
         return path
 
 
+class PageCache:
+    """Persistent on-disk cache of fetched page HTML, keyed by URL hash."""
+    
+    def __init__(self, cache_dir, ttl: Optional[float] = 24 * 60 * 60):
+        """
+        Initialize the page cache.
+        
+        Args:
+            cache_dir: Directory holding cached pages
+            ttl: Seconds a cached page stays valid, or None to never expire
+        """
+        self.cache_dir = FileUtils.ensure_directory(Path(cache_dir))
+        self.ttl = ttl
+        
+    def _path_for(self, url: str) -> Path:
+        """Get the cache file path for a URL."""
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return self.cache_dir / f"{key}.html.gz"
+        
+    def _write_atomic(self, path: Path, data: bytes) -> None:
+        """Write data through a unique temp file so concurrent writers never clash."""
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_name, path)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+            
+    def get(self, url: str) -> Optional[str]:
+        """Return cached HTML for a URL, or None on a miss or expired entry."""
+        path = self._path_for(url)
+        try:
+            if self.ttl is not None and time.time() - path.stat().st_mtime > self.ttl:
+                return None
+        except FileNotFoundError:
+            return None
+        entry = self.get_entry(url)
+        return entry[0] if entry else None
+        
+    def get_entry(self, url: str) -> Optional[Tuple[str, Optional[str]]]:
+        """
+        Return cached HTML and its ETag for a URL, ignoring the TTL.
+        
+        Used to revalidate an expired entry with a conditional request.
+        
+        Returns:
+            Tuple of (html, etag or None), or None if nothing is cached
+        """
+        path = self._path_for(url)
+        try:
+            html_content = gzip.decompress(path.read_bytes()).decode('utf-8')
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, UnicodeDecodeError) as e:
+            logger.warning(f"Ignoring unreadable cache entry for {url}: {e}")
+            return None
+        try:
+            etag = path.with_suffix('.etag').read_text(encoding='utf-8') or None
+        except OSError:
+            etag = None
+        return html_content, etag
+            
+    def set(self, url: str, html_content: Union[str, bytes], etag: Optional[str] = None) -> None:
+        """Store HTML (or already UTF-8 encoded text) for a URL, with the response ETag if the server sent one."""
+        path = self._path_for(url)
+        data = html_content if isinstance(html_content, bytes) else html_content.encode('utf-8')
+        try:
+            self._write_atomic(path, gzip.compress(data, compresslevel=3))
+            etag_path = path.with_suffix('.etag')
+            if etag:
+                self._write_atomic(etag_path, etag.encode('utf-8'))
+            elif etag_path.exists():
+                etag_path.unlink()
+        except OSError as e:
+            logger.warning(f"Failed to cache {url}: {e}")
+            
+    def touch(self, url: str) -> None:
+        """Mark a cached entry as fresh again, e.g. after a 304 Not Modified."""
+        try:
+            self._path_for(url).touch()
+        except OSError as e:
+            logger.warning(f"Failed to refresh cache entry for {url}: {e}")
+
+
 class ContentCleaner:
     """Utility class for cleaning and processing content."""
     
@@ -79,67 +426,43 @@ class ContentCleaner:
     @staticmethod
     def clean_markdown_links(content: str) -> str:
         """Clean markdown links by removing URLs but keeping link text."""
-        # Pattern to match markdown links with URLs
-        link_pattern = re.compile(r'\[([^\]]+)\]\((?![s\)])[^\)]+\)')
-        # Replace with empty parentheses
-        return link_pattern.sub(r'[\1]()', content)
+        # Replace markdown link URLs with empty parentheses
+        return _MARKDOWN_LINK_RE.sub(r'[\1]()', content)
     
     @staticmethod
     def remove_deepwiki_chrome(content: str) -> str:
         """Remove DeepWiki-specific navigation and promotional content."""
-        lines = content.split('\n')
-        filtered_lines = []
-        i = 0
+        return '\n'.join(ContentCleaner._without_chrome(content.split('\n')))
+    
+    @staticmethod
+    def _without_chrome(lines: List[str]) -> Iterator[str]:
+        """Yield the lines that are not DeepWiki navigation or promotional content."""
+        # List items past this line belong to the trailing "On this page" section
+        toc_start = len(lines) * 0.8
         
-        while i < len(lines):
-            line = lines[i].strip()
+        for i, raw_line in enumerate(lines):
+            line = raw_line.strip()
             
             # Skip promotional and navigation content patterns
-            skip_patterns = [
-                # Promotional links
-                r'^\[Get free private DeepWikis.*\]\(\)$',
-                r'^\[.*DeepWiki.*\]\(\)$',
-                r'^\[.*Devin.*\]\(\).*Share$',
-                # Navigation elements
-                r'^Menu$',
-                r'^Share$',
-                r'^Dismiss$',
-                r'^Refresh this wiki$',
-                r'^Enter email to refresh$',
-                r'^Ask Devin about.*$',
-                r'^Deep Research$',
-                # Combined navigation text
-                r'^DismissEnter email to refresh$',
-                r'^.*Dismiss.*refresh.*$',
-                # Metadata
-                r'^Last indexed:.*\(\)$',
-                r'^Last indexed:.*$',
-                # Table of contents at bottom
-                r'^### On this page$',
-                r'^Ask.*about.*$'
-            ]
-            
-            # Check if line matches any skip pattern
-            should_skip = False
-            for pattern in skip_patterns:
-                if re.match(pattern, line, re.IGNORECASE):
-                    should_skip = True
-                    break
-            
-            # Skip empty promotional links like [DeepWiki]()
-            if re.match(r'^\[.*\]\(\)$', line) and any(keyword in line.lower() for keyword in ['deepwiki', 'devin', 'private']):
-                should_skip = True
+            if _CHROME_LINE_RE.match(line):
+                continue
             
             # Special case: Skip "On this page" sections at the end
-            if line == "### On this page" or line.startswith("* [") and i > len(lines) * 0.8:
-                should_skip = True
-            
-            if not should_skip:
-                filtered_lines.append(lines[i])
+            if line.startswith("* [") and i > toc_start:
+                continue
             
-            i += 1
-        
-        return '\n'.join(filtered_lines)
+            yield raw_line
+    
+    def clean_markdown_content(self, content: str) -> str:
+        """Remove DeepWiki chrome and CSS/Mermaid content in a single pass over the lines.
+        
+        Equivalent to remove_deepwiki_chrome followed by filter_css_mermaid_content,
+        without splitting and re-joining the content in between.
+        """
+        lines = self._without_chrome(content.split('\n'))
+        if any(marker in content for marker in _CSS_MERMAID_MARKERS):
+            lines = self._without_css_mermaid(lines)
+        return '\n'.join(lines)
     
     def extract_and_convert_svgs(self, html_content: str) -> tuple[str, dict]:
         """Extract SVG flowcharts from HTML, convert to ASCII, and return modified HTML with replacements."""
@@ -150,66 +473,69 @@ class ContentCleaner:
             logger.warning("No SVG converter available, returning unchanged HTML")
             return html_content, {}
         
-        # Pattern to find SVG flowcharts
-        svg_pattern = r'<svg[^>]*aria-roledescription="flowchart[^"]*"[^>]*>.*?</svg>'
         svg_replacements = {}
-        placeholder_counter = 0
         
-        logger.debug(f"Using SVG pattern: {svg_pattern}")
+        logger.debug(f"Using SVG pattern: {_SVG_FLOWCHART_RE.pattern}")
         
         # Find all SVG matches first for logging
-        matches = list(re.finditer(svg_pattern, html_content, flags=re.DOTALL | re.IGNORECASE))
+        matches = list(_SVG_FLOWCHART_RE.finditer(html_content))
         logger.info(f"Found {len(matches)} SVG flowcharts in HTML content")
         
-        for i, match in enumerate(matches):
-            svg_preview = match.group(0)[:100] + "..." if len(match.group(0)) > 100 else match.group(0)
-            logger.debug(f"SVG {i}: Position {match.start()}-{match.end()}, Preview: {svg_preview}")
+        # Previews are only built when they will be emitted
+        if logger.isEnabledFor(logging.DEBUG):
+            for i, match in enumerate(matches):
+                svg_preview = match.group(0)[:100] + "..." if len(match.group(0)) > 100 else match.group(0)
+                logger.debug(f"SVG {i}: Position {match.start()}-{match.end()}, Preview: {svg_preview}")
         
-        def replace_svg(match):
-            nonlocal placeholder_counter
-            svg_content = match.group(0)
-            placeholder = f"<!-- SVG_PLACEHOLDER_{placeholder_counter} -->"
+        def replacement_for(index: int, result: Dict[str, Any]) -> str:
+            placeholder = f"<!-- SVG_PLACEHOLDER_{index} -->"
             
-            logger.info(f"Processing SVG flowchart {placeholder_counter}: {len(svg_content)} chars")
-            logger.debug(f"Placeholder created: {placeholder}")
+            logger.debug(f"Conversion result for SVG {index}: success={result['success']}, "
+                       f"d2_code_length={len(result.get('d2_code', ''))}, "
+                       f"ascii_length={len(result.get('ascii_diagram', ''))}")
             
-            try:
-                logger.info(f"Converting SVG {placeholder_counter} to ASCII...")
-                result = self.svg_converter.convert_svg_to_ascii(svg_content)
-                
-                logger.debug(f"Conversion result for SVG {placeholder_counter}: success={result['success']}, "
-                           f"d2_code_length={len(result.get('d2_code', ''))}, "
-                           f"ascii_length={len(result.get('ascii_diagram', ''))}")
-                
-                if result['success']:
-                    logger.info(f"Successfully converted SVG {placeholder_counter} to ASCII")
-                    svg_replacements[placeholder] = result['ascii_diagram']
-                    logger.debug(f"Stored ASCII diagram for {placeholder}: {len(result['ascii_diagram'])} chars")
-                else:
-                    error_msg = result.get('error', 'Unknown error')
-                    logger.warning(f"SVG {placeholder_counter} conversion failed: {error_msg}")
-                    fallback_content = f"```\n[Flowchart conversion failed: {error_msg}]\n```"
-                    svg_replacements[placeholder] = fallback_content
-                    logger.debug(f"Stored fallback content for {placeholder}: {fallback_content}")
-            except Exception as e:
-                logger.error(f"Error converting SVG {placeholder_counter}: {e}")
-                import traceback
-                logger.debug(f"Full traceback for SVG {placeholder_counter}: {traceback.format_exc()}")
-                fallback_content = f"```\n[Flowchart conversion error: {str(e)}]\n```"
-                svg_replacements[placeholder] = fallback_content
-                logger.debug(f"Stored error fallback for {placeholder}: {fallback_content}")
+            if result['success']:
+                logger.info(f"Successfully converted SVG {index} to ASCII")
+                logger.debug(f"Stored ASCII diagram for {placeholder}: {len(result['ascii_diagram'])} chars")
+                return result['ascii_diagram']
+            error_msg = result.get('error', 'Unknown error')
+            logger.warning(f"SVG {index} conversion failed: {error_msg}")
+            fallback_content = f"```\n[Flowchart conversion failed: {error_msg}]\n```"
+            logger.debug(f"Stored fallback content for {placeholder}: {fallback_content}")
+            return fallback_content
+            
+        # The converter batches the flowcharts of one page into shared,
+        # concurrently sent LLM requests
+        svgs = [match.group(0) for match in matches]
+        try:
+            logger.info(f"Converting {len(svgs)} SVGs to ASCII...")
+            results = self.svg_converter.convert_many(svgs) if svgs else []
+            contents = [replacement_for(i, result) for i, result in enumerate(results)]
+        except Exception as e:
+            logger.error(f"Error converting SVGs: {e}")
+            logger.debug("Full traceback:", exc_info=True)
+            contents = [f"```\n[Flowchart conversion error: {str(e)}]\n```"] * len(svgs)
+        # The SVG copies are no longer needed once converted; dropping them
+        # keeps them from sitting alongside the rebuilt HTML below
+        del svgs
             
-            placeholder_counter += 1
-            logger.debug(f"Returning placeholder {placeholder} for SVG replacement")
-            return placeholder
-        
         # Replace SVG flowcharts with placeholders
         logger.info("Replacing SVG flowcharts with placeholders in HTML...")
-        modified_html = re.sub(svg_pattern, replace_svg, html_content, flags=re.DOTALL | re.IGNORECASE)
+        html_parts = []
+        last_end = 0
+        for i, (match, content) in enumerate(zip(matches, contents)):
+            placeholder = f"<!-- SVG_PLACEHOLDER_{i} -->"
+            svg_replacements[placeholder] = content
+            html_parts.append(html_content[last_end:match.start()])
+            html_parts.append(placeholder)
+            last_end = match.end()
+        html_parts.append(html_content[last_end:])
+        modified_html = ''.join(html_parts)
         
         logger.info(f"SVG extraction completed: {len(svg_replacements)} replacements created")
-        logger.debug(f"Replacement keys: {list(svg_replacements.keys())}")
-        logger.debug(f"Modified HTML length: {len(modified_html)} chars (original: {len(html_content)})")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Replacement keys: {list(svg_replacements.keys())}")
+            logger.debug(f"Modified HTML length: {len(modified_html)} chars (original: {len(html_content)})")
         
         return modified_html, svg_replacements
     
@@ -224,39 +550,33 @@ class ContentCleaner:
             return markdown_content
         
         original_content = markdown_content
-        replacements_made = 0
-        
-        for placeholder, ascii_diagram in svg_replacements.items():
-            logger.debug(f"Looking for placeholder: {placeholder}")
-            
-            # Count occurrences before replacement
-            occurrence_count = markdown_content.count(placeholder)
-            logger.debug(f"Placeholder '{placeholder}' found {occurrence_count} times in markdown")
-            
-            if occurrence_count == 0:
-                logger.warning(f"Placeholder '{placeholder}' not found in markdown content!")
-                # Let's search for similar placeholders to debug
-                similar_placeholders = [line.strip() for line in markdown_content.split('\n') if 'SVG_PLACEHOLDER' in line]
-                logger.debug(f"Found these SVG placeholders in markdown: {similar_placeholders}")
-                continue
+        replaced = set()
+        
+        def replace_placeholder(match):
+            placeholder = match.group(0)
+            ascii_diagram = svg_replacements.get(placeholder)
+            if ascii_diagram is None:
+                return placeholder
+            replaced.add(placeholder)
+            return ascii_diagram
             
-            # Perform replacement
-            logger.debug(f"Replacing placeholder with ASCII diagram ({len(ascii_diagram)} chars)")
-            markdown_content = markdown_content.replace(placeholder, ascii_diagram)
-            replacements_made += 1
-            
-            # Verify replacement
-            remaining_count = markdown_content.count(placeholder)
-            logger.debug(f"After replacement: {occurrence_count - remaining_count} instances replaced, {remaining_count} remaining")
-            
-            if remaining_count > 0:
-                logger.warning(f"Still {remaining_count} instances of '{placeholder}' remaining after replacement")
+        # One scan substitutes every placeholder, instead of a replace and
+        # two counts over the whole document per diagram
+        markdown_content = _SVG_PLACEHOLDER_RE.sub(replace_placeholder, markdown_content)
+        replacements_made = len(replaced)
         
+        for placeholder in svg_replacements:
+            if placeholder not in replaced:
+                logger.warning(f"Placeholder '{placeholder}' not found in markdown content!")
+                
         logger.info(f"Placeholder replacement completed: {replacements_made}/{len(svg_replacements)} replacements made")
         logger.debug(f"Final markdown length: {len(markdown_content)} chars (original: {len(original_content)})")
         
-        # Check if any placeholders remain in the final content
-        remaining_placeholders = [line.strip() for line in markdown_content.split('\n') if 'SVG_PLACEHOLDER' in line]
+        # Check if any placeholders remain in the final content, splitting
+        # into lines only when there is one to report
+        remaining_placeholders = []
+        if 'SVG_PLACEHOLDER' in markdown_content:
+            remaining_placeholders = [line.strip() for line in markdown_content.split('\n') if 'SVG_PLACEHOLDER' in line]
         if remaining_placeholders:
             logger.warning(f"Found {len(remaining_placeholders)} unreplaced SVG placeholders: {remaining_placeholders[:3]}{'...' if len(remaining_placeholders) > 3 else ''}")
         else:
@@ -266,8 +586,16 @@ class ContentCleaner:
     
     def filter_css_mermaid_content(self, content: str) -> str:
         """Filter out CSS/Mermaid content from markdown."""
-        lines = content.split('\n')
-        filtered_lines = []
+        # Most pages carry no diagram styling at all; a few substring scans
+        # over the whole text rule that out without splitting it into lines
+        if not any(marker in content for marker in _CSS_MERMAID_MARKERS):
+            return content
+        
+        return '\n'.join(self._without_css_mermaid(content.split('\n')))
+    
+    @staticmethod
+    def _without_css_mermaid(lines: Iterable[str]) -> Iterator[str]:
+        """Yield the lines that are not CSS/Mermaid styling."""
         in_code_block = False
         skip_css_block = False
         
@@ -283,7 +611,7 @@ class ContentCleaner:
                 
                 # Don't include the opening ``` for CSS blocks
                 if not skip_css_block:
-                    filtered_lines.append(line)
+                    yield line
                 continue
             
             # Skip CSS/Mermaid content in code blocks
@@ -297,64 +625,54 @@ class ContentCleaner:
                 'stroke-dasharray' in line):
                 continue
             
-            filtered_lines.append(line)
-        
-        return '\n'.join(filtered_lines)
+            yield line
     
     @staticmethod
     def remove_navigation_elements(html_content: str) -> str:
         """Remove common navigation elements from HTML."""
-        from bs4 import BeautifulSoup
-        
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
+        soup = BeautifulSoup(html_content, HTML_PARSER)
+        ContentCleaner.remove_navigation_from_soup(soup)
+        return str(soup)
+    
+    @staticmethod
+    def remove_navigation_from_soup(soup) -> None:
+        """Remove common navigation elements from a parsed element, in place."""
         # Remove navigation menus (common selectors)
-        nav_selectors = [
-            'ul.flex-1.flex-shrink-0.space-y-1.overflow-y-auto.py-1',
-            'nav',
-            '.navigation',
-            '.sidebar',
-            '.menu',
-            '.header-nav',
-            '.footer',
-            '.page-nav',
-            '.breadcrumb'
-        ]
-        
-        for selector in nav_selectors:
-            elements = soup.select(selector)
-            for element in elements:
-                element.decompose()
+        for element in _NAV_ELEMENT_PATTERN.select(soup):
+            element.decompose()
         
         # Remove elements containing promotional text
-        promotional_texts = [
-            'Get free private DeepWikis',
-            'Ask Devin about',
-            'Deep Research',
-            'Last indexed',
-            'Refresh this wiki'
-        ]
-        
-        for text in promotional_texts:
-            elements = soup.find_all(string=lambda s: s and text in s)
-            for element in elements:
-                if element.parent:
-                    element.parent.decompose()
-        
-        return str(soup)
+        for element in soup.find_all(string=_PROMOTIONAL_TEXT_RE):
+            if getattr(element, '_decomposed', False):
+                # Already gone with an earlier match's parent
+                continue
+            if element.parent is soup:
+                # A string directly under the root takes the root with it
+                soup.clear()
+            elif element.parent:
+                element.parent.decompose()
     
     @staticmethod
     def extract_title_from_content(html_content: str) -> Optional[str]:
         """Extract title from HTML content."""
-        from bs4 import BeautifulSoup
-        
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
+        end = _H1_END_RE.search(html_content, 0, _TITLE_PROBE_CHARS)
+        start = end and _H1_START_RE.search(html_content, 0, end.start())
+        if start and not _H1_UNSAFE_CONTENT_RE.search(html_content, start.end(), end.start()):
+            # The document's first <h1> is complete within this prefix
+            heading = BeautifulSoup(html_content[:end.end()], HTML_PARSER).find('h1')
+            title = heading.get_text(strip=True) if heading else None
+            if title:
+                return title
+        
+        soup = BeautifulSoup(html_content, HTML_PARSER)
+        return ContentCleaner.extract_title_from_soup(soup)
+    
+    @staticmethod
+    def extract_title_from_soup(soup) -> Optional[str]:
+        """Extract title from an already parsed BeautifulSoup document."""
         # Try different title selectors
-        title_selectors = ['h1', 'title', '.page-title', '.article-title']
-        
-        for selector in title_selectors:
-            element = soup.select_one(selector)
+        for pattern in _TITLE_PATTERNS:
+            element = pattern.select_one(soup)
             if element:
                 title = element.get_text(strip=True)
                 if title:
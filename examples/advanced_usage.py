@@ -3,7 +3,7 @@
 
 import asyncio
 from pathlib import Path
-from deepwiki2md import DeepWikiScraper, MarkdownConverter, DeepWikiURL
+from deepwiki2md import DeepWikiScraper, MarkdownConverter, DeepWikiURL, parse_deepwiki_url
 
 
 async def main():
@@ -51,7 +51,7 @@ async def main():
         
         # Process results
         for library_url, pages in results.items():
-            library_name = DeepWikiURL(library_url).library_name
+            library_name = parse_deepwiki_url(library_url).library_name
             print(f"📚 {library_name}: {len(pages)} pages")
             
             # Show file sizes
@@ -3,7 +3,7 @@
 
 import asyncio
 from pathlib import Path
-from deepwiki2md import DeepWikiScraper, DeepWikiURL
+from deepwiki2md import DeepWikiScraper, parse_deepwiki_url
 
 
 async def main():
@@ -20,7 +20,7 @@ async def main():
     valid_libraries = []
     
     for url_str in libraries:
-        url = DeepWikiURL(url_str)
+        url = parse_deepwiki_url(url_str)
         if url.is_valid_deepwiki():
             valid_libraries.append(url_str)
             print(f"   ✅ {url.library_name}")
@@ -59,7 +59,7 @@ async def main():
         print("=" * 50)
         
         for library_url, pages in results.items():
-            url = DeepWikiURL(library_url)
+            url = parse_deepwiki_url(library_url)
             library_name = url.library_name
             
             if pages:
@@ -1,13 +1,23 @@
 """Test markdown conversion functionality."""
 
 import pytest
+from bs4 import BeautifulSoup
 from deepwiki2md.converter import MarkdownConverter
+from deepwiki2md.svg_converter import SVGToD2Converter
+
+
+@pytest.fixture(params=["lxml", "html.parser"])
+def html_parser(request, monkeypatch):
+    """Run a test under both the lxml backend and the stdlib fallback."""
+    monkeypatch.setattr("deepwiki2md.converter.HTML_PARSER", request.param)
+    monkeypatch.setattr("deepwiki2md.utils.HTML_PARSER", request.param)
+    return request.param
 
 
 class TestMarkdownConverter:
     """Test MarkdownConverter functionality."""
     
-    def test_basic_conversion(self):
+    def test_basic_conversion(self, html_parser):
         """Test basic HTML to Markdown conversion."""
         converter = MarkdownConverter()
         
@@ -28,12 +38,12 @@ class TestMarkdownConverter:
         result = converter.convert_page(html, "https://example.com/test")
         
         assert result["success"]
-        assert result["title"] == "Test Page"
+        assert result["title"] == "Main Title"
         assert "# Main Title" in result["content"]
         assert "**bold**" in result["content"]
         assert "* Item 1" in result["content"]
     
-    def test_navigation_stripping(self):
+    def test_navigation_stripping(self, html_parser):
         """Test navigation element removal."""
         converter = MarkdownConverter(strip_navigation=True)
         
@@ -64,6 +74,79 @@ class TestMarkdownConverter:
         assert result["content"] == ""
         assert result["title"] == ""
     
+    def test_element_conversion_matches_html(self, html_parser):
+        """Test that converting a parsed element leaves it untouched and matches converting its HTML."""
+        converter = MarkdownConverter(strip_navigation=True)
+        
+        html = """
+        <body><ul><li>Outer
+            <div><ul><li>Item<nav>Menu</nav></li></ul></div>
+        </li></ul><main class="footer">Footer</main></body>
+        """
+        soup = BeautifulSoup(html, html_parser)
+        before = str(soup)
+        
+        for element in soup.find("div"), soup.find("main"):
+            assert converter.html_to_markdown(element) == converter.html_to_markdown(str(element))
+        assert converter.html_to_markdown(soup.find("main")) == ""
+        assert str(soup) == before
+    
+    def test_result_cache(self, tmp_path, monkeypatch):
+        """Test that unchanged pages reuse the cached conversion."""
+        converter = MarkdownConverter(cache_dir=tmp_path)
+        html = "<html><body><h1>Cached</h1><p>Content</p></body></html>"
+        
+        first = converter.convert_page(html)
+        monkeypatch.setattr(converter, "_convert_page", lambda *args: pytest.fail("page converted again"))
+        second = converter.convert_page(html)
+        
+        assert first["success"]
+        assert second == first
+        assert MarkdownConverter(heading_style="SETEXT", cache_dir=tmp_path)._result_cache_key(html) != \
+            converter._result_cache_key(html)
+    
+    def test_svg_result_cache(self, tmp_path, monkeypatch):
+        """Test that an unchanged SVG diagram is only sent to the LLM once."""
+        converter = SVGToD2Converter("http://localhost:1234/v1", "dummy-key", cache_dir=tmp_path)
+        calls = []
+        monkeypatch.setattr(converter, "_call_llm_api",
+                            lambda svg: calls.append(svg) or "```d2\nA: Start\nA -> B\n```")
+        svg = '<svg aria-roledescription="flowchart-v2"><g class="node"></g></svg>'
+        
+        first = converter.convert_svg_to_ascii(svg)
+        second = converter.convert_svg_to_ascii(svg)
+        # A fresh converter reads the diagram back from disk
+        reloaded = SVGToD2Converter("http://localhost:1234/v1", "dummy-key", cache_dir=tmp_path)
+        monkeypatch.setattr(reloaded, "_call_llm_api", lambda svg: pytest.fail("SVG converted again"))
+        third = reloaded.convert_svg_to_ascii(svg)
+        
+        assert first["success"]
+        assert len(calls) == 1
+        assert second == first
+        assert third == first
+    
+    def test_svg_batch_failure_falls_back(self, monkeypatch):
+        """Test that a failed batch request still converts each SVG on its own."""
+        converter = SVGToD2Converter("http://localhost:1234/v1", "dummy-key", max_concurrency=1)
+        
+        def fail_batch(svg_contents, prompt_svgs):
+            raise RuntimeError("batch request failed")
+            
+        def convert_one(svg):
+            if "broken" in svg:
+                raise RuntimeError("bad diagram")
+            return "```d2\nA -> B\n```"
+            
+        monkeypatch.setattr(converter, "_convert_batch", fail_batch)
+        monkeypatch.setattr(converter, "_call_llm_api", convert_one)
+        svgs = [f'<svg aria-roledescription="flowchart-v2"><g id="{name}"></g></svg>'
+                for name in ("first", "broken", "third")]
+        
+        results = converter.convert_many(svgs)
+        
+        assert [result["success"] for result in results] == [True, False, True]
+        assert "bad diagram" in results[1]["error"]
+    
     def test_setext_headings(self):
         """Test setext heading style."""
         converter = MarkdownConverter(heading_style="SETEXT")
@@ -0,0 +1,257 @@
+"""Test scraper page fetching."""
+
+import asyncio
+import sys
+
+import pytest
+
+from deepwiki2md import cli
+from deepwiki2md import fallback_scraper as fallback_scraper_module
+from deepwiki2md import scraper as scraper_module
+from deepwiki2md.fallback_scraper import FallbackScraper
+from deepwiki2md.scraper import DeepWikiScraper
+
+LIBRARY_HTML = (
+    "<html><body><nav><ul>"
+    + "".join(f'<li><a href="/owner/{{library}}/{i}">Page {i}</a></li>' for i in range(4))
+    + "</ul></nav><main><h1>Overview</h1><p>Content</p></main></body></html>"
+)
+
+
+class FakeTab:
+    """Browser tab whose navigation fails for as long as it is marked broken."""
+    
+    def __init__(self, broken):
+        self.broken = broken
+        self.closed = False
+        
+    async def go_to(self, url):
+        if self.broken:
+            raise asyncio.TimeoutError("navigation timed out")
+            
+    async def query(self, selector, timeout=0, find_all=False, raise_exc=True):
+        return [] if find_all else None
+        
+    @property
+    async def page_source(self):
+        return "<html><body><main><h1>Page</h1><p>Content</p></main></body></html>"
+        
+    async def execute_command(self, command):
+        return None
+        
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    """Browser handing out fresh, working tabs."""
+    
+    def __init__(self):
+        self.tabs = []
+        
+    async def new_tab(self):
+        tab = FakeTab(broken=False)
+        self.tabs.append(tab)
+        return tab
+
+
+class LibraryTab(FakeTab):
+    """Tab serving a library page with navigation, or one of its pages."""
+    
+    loading = 0
+    peak_loading = 0
+    
+    def __init__(self):
+        super().__init__(broken=False)
+        self.url = None
+        
+    async def go_to(self, url):
+        self.url = url
+        LibraryTab.loading += 1
+        LibraryTab.peak_loading = max(LibraryTab.peak_loading, LibraryTab.loading)
+        await asyncio.sleep(0.01)
+        LibraryTab.loading -= 1
+        
+    @property
+    async def page_source(self):
+        parts = self.url.rstrip("/").split("/")
+        if len(parts) == 5:
+            return LIBRARY_HTML.format(library=parts[-1])
+        return f"<html><body><main><h1>{parts[-2]} {parts[-1]}</h1><p>Content</p></main></body></html>"
+
+
+class DiagramTab(FakeTab):
+    """Tab whose sidebar is there at once but whose diagram renders only after a few checks."""
+    
+    def __init__(self, render_after):
+        super().__init__(broken=False)
+        self.render_after = render_after
+        self.checks = 0
+        
+    async def query(self, selector, timeout=0, find_all=False, raise_exc=True):
+        if selector == scraper_module._DIAGRAM_SOURCE_SELECTOR:
+            self.checks += 1
+            # Mermaid draws into the source block, so it stays in the DOM
+            return [object()]
+        if selector == scraper_module._DIAGRAM_SELECTOR:
+            return [object()] if self.checks > self.render_after else []
+        return object() if not find_all else [object()]
+        
+    @property
+    async def page_source(self):
+        if self.checks > self.render_after:
+            diagram = '<svg aria-roledescription="flowchart-v2"><g></g></svg>'
+        else:
+            diagram = "graph TD; A--&gt;B"
+        return f'<html><body><nav><ul></ul></nav><main><pre class="mermaid">{diagram}</pre></main></body></html>'
+
+
+class StaticResponse:
+    """Plain HTTP response already holding the rendered library page or one of its pages."""
+    
+    status_code = 200
+    headers = {}
+    
+    def __init__(self, url):
+        parts = url.rstrip("/").split("/")
+        if len(parts) == 5:
+            self.text = LIBRARY_HTML.format(library=parts[-1])
+        else:
+            self.text = f"<html><body><ul></ul><main><h1>{parts[-1]}</h1><p>Content</p></main></body></html>"
+        self.text = self.text.replace("<ul>", '<ul class="flex-1 flex-shrink-0">', 1)
+        self.content = self.text.encode()
+        
+    def raise_for_status(self):
+        pass
+
+
+class StaticSession:
+    """HTTP session serving every URL as a StaticResponse."""
+    
+    def get(self, url, timeout, headers=None):
+        return StaticResponse(url)
+
+
+class FakeChrome:
+    """PyDoll Chrome stand-in counting the tabs it opens."""
+    
+    tabs = []
+    
+    def __init__(self, options=None):
+        pass
+        
+    async def __aenter__(self):
+        return self
+        
+    async def __aexit__(self, *exc):
+        return None
+        
+    async def start(self):
+        return await self.new_tab()
+        
+    async def new_tab(self):
+        tab = LibraryTab()
+        FakeChrome.tabs.append(tab)
+        return tab
+
+
+@pytest.fixture
+def fake_chrome(monkeypatch):
+    """Replace Chrome with FakeChrome, starting from no tabs and no page loads."""
+    monkeypatch.setattr(scraper_module, "Chrome", FakeChrome)
+    monkeypatch.setattr(FakeChrome, "tabs", [])
+    monkeypatch.setattr(LibraryTab, "loading", 0)
+    monkeypatch.setattr(LibraryTab, "peak_loading", 0)
+    return FakeChrome
+
+
+class TestDeepWikiScraper:
+    """Test DeepWikiScraper page fetching."""
+    
+    def test_retry_uses_fresh_tab(self, tmp_path, monkeypatch):
+        """Test that a failed navigation closes its tab instead of retrying on it."""
+        monkeypatch.setattr(scraper_module, "_RETRY_BACKOFF", 0)
+        scraper = DeepWikiScraper(output_dir=str(tmp_path), prefer_static=False)
+        browser = FakeBrowser()
+        broken_tab = FakeTab(broken=True)
+        idle_tabs = [broken_tab]
+        
+        html = asyncio.run(scraper._fetch_page(browser, idle_tabs, "https://deepwiki.com/owner/repo"))
+        
+        assert html
+        assert broken_tab.closed
+        assert broken_tab not in idle_tabs
+        assert idle_tabs == browser.tabs
+    
+    def test_page_read_after_diagrams_render(self, tmp_path, monkeypatch):
+        """Test that a page is not read as soon as its sidebar shows, before its diagrams are drawn."""
+        monkeypatch.setattr(scraper_module, "_RENDER_SETTLE", 0)
+        monkeypatch.setattr(scraper_module, "_RENDER_POLL", 0)
+        scraper = DeepWikiScraper(output_dir=str(tmp_path))
+        tab = DiagramTab(render_after=3)
+        
+        html = asyncio.run(scraper._get_page_content(tab, "https://deepwiki.com/owner/repo"))
+        
+        assert 'aria-roledescription="flowchart-v2"' in html
+    
+    def test_static_fetch_leaves_diagrams_to_browser(self, tmp_path):
+        """Test that server HTML with unrendered Mermaid diagrams is not used as is."""
+        scraper = DeepWikiScraper(output_dir=str(tmp_path), prefer_static=True)
+        page = '<ul class="flex-1 flex-shrink-0"></ul><main><p>Content</p>{}</main>'
+        
+        class FakeResponse:
+            status_code = 200
+            
+            def __init__(self, text):
+                self.text = text
+                self.content = text.encode()
+                
+        for body, expected in [("", True), ('<pre class="mermaid">graph TD; A--&gt;B</pre>', False)]:
+            html = page.format(body)
+            scraper._session = type("FakeSession", (), {"get": lambda self, url, timeout: FakeResponse(html)})()
+            assert (scraper._fetch_static("https://deepwiki.com/owner/repo", 30) == html) is expected
+    
+    def test_libraries_share_tab_limit(self, tmp_path, monkeypatch, fake_chrome):
+        """Test that concurrently scraped libraries stay within max_concurrency tabs."""
+        monkeypatch.setattr(scraper_module.random, "uniform", lambda a, b: 0)
+        scraper = DeepWikiScraper(output_dir=str(tmp_path), max_concurrency=2)
+        urls = [f"https://deepwiki.com/owner/lib{i}" for i in range(3)]
+        
+        results = asyncio.run(scraper.scrape_multiple_libraries(urls, save_files=False,
+                                                                max_concurrent_libraries=3))
+        
+        assert [len(pages) for pages in results.values()] == [4, 4, 4]
+        assert len(FakeChrome.tabs) == 2
+        assert LibraryTab.peak_loading == 2
+    
+    def test_cli_static_run_skips_browser(self, tmp_path, monkeypatch, fake_chrome):
+        """Test that a CLI run whose pages are all served over plain HTTP never starts the browser."""
+        monkeypatch.setattr(scraper_module, "get_http_session", lambda pool_size: StaticSession())
+        monkeypatch.setattr(scraper_module.random, "uniform", lambda a, b: 0)
+        monkeypatch.setattr(sys, "argv", ["deepwiki2md", "scrape", "--prefer-static", "--output-dir",
+                                          str(tmp_path), "https://deepwiki.com/owner/lib"])
+        
+        cli.main()
+        
+        assert FakeChrome.tabs == []
+        assert len(list((tmp_path / "lib").glob("*.md"))) == 4
+    
+    def test_cli_runs_fallback_scraper(self, tmp_path, monkeypatch):
+        """Test that the CLI's arguments and async with block work with FallbackScraper."""
+        monkeypatch.setattr(cli, "DeepWikiScraper", FallbackScraper)
+        monkeypatch.setattr(fallback_scraper_module, "get_http_session", lambda pool_size: StaticSession())
+        monkeypatch.setattr(sys, "argv", ["deepwiki2md", "scrape", "--prefer-static", "--convert-processes", "2",
+                                          "--output-dir", str(tmp_path), "https://deepwiki.com/owner/lib"])
+        
+        cli.main()
+        
+        assert len(list((tmp_path / "lib").glob("*.md"))) == 4
+    
+    def test_worker_processes_stop_after_scrape(self, tmp_path, fake_chrome):
+        """Test that a scrape outside a context manager doesn't leave worker processes running."""
+        scraper = DeepWikiScraper(output_dir=str(tmp_path), convert_processes=1)
+        
+        page = asyncio.run(scraper.scrape_page("https://deepwiki.com/owner/lib/1"))
+        
+        assert page["title"] == "lib 1"
+        assert scraper._convert_pool is None
@@ -1,7 +1,10 @@
 """Test utilities and URL handling."""
 
+import os
+import time
+
 import pytest
-from deepwiki2md.utils import DeepWikiURL
+from deepwiki2md.utils import DeepWikiURL, PageCache, parse_deepwiki_url
 
 
 class TestDeepWikiURL:
@@ -31,6 +34,13 @@ class TestDeepWikiURL:
         assert url.library_name == "Amalgam"
         assert len(url.path_parts) == 3
     
+    def test_shared_url_path_parts(self):
+        """Test that changing returned path parts doesn't affect the cached parse."""
+        url = "https://deepwiki.com/rei-2/Amalgam"
+        parse_deepwiki_url(url).path_parts.append("extra")
+        
+        assert parse_deepwiki_url(url).path_parts == ["rei-2", "Amalgam"]
+    
     def test_malformed_url(self):
         """Test malformed URL handling."""
         url = DeepWikiURL("not-a-url")
@@ -44,4 +54,55 @@ class TestDeepWikiURL:
         
         assert not url.is_valid_deepwiki()
         assert url.domain == ""
-        assert url.library_name == ""
\ No newline at end of file
+        assert url.library_name == ""
+    
+    def test_resolve_href(self):
+        """Test resolving navigation links against the base URL."""
+        base = "https://deepwiki.com"
+        
+        assert DeepWikiURL.resolve_href(base, "/rei-2/Amalgam/1-overview") == "https://deepwiki.com/rei-2/Amalgam/1-overview"
+        assert DeepWikiURL.resolve_href(base, "https://example.com/a") == "https://example.com/a"
+        assert DeepWikiURL.resolve_href(base, "//cdn.example.com/a") == "https://cdn.example.com/a"
+        assert DeepWikiURL.resolve_href(base, "/rei-2/../Amalgam") == "https://deepwiki.com/Amalgam"
+        assert DeepWikiURL.resolve_href(base, "Amalgam") == "https://deepwiki.com/Amalgam"
+
+
+class TestPageCache:
+    """Test PageCache functionality."""
+    
+    def test_round_trip(self, tmp_path):
+        """Test storing and retrieving cached HTML."""
+        cache = PageCache(tmp_path / "cache")
+        url = "https://deepwiki.com/rei-2/Amalgam/1-overview"
+        
+        assert cache.get(url) is None
+        cache.set(url, "<html><body>Überblick</body></html>")
+        assert cache.get(url) == "<html><body>Überblick</body></html>"
+        assert cache.get("https://deepwiki.com/rei-2/Amalgam") is None
+    
+    def test_expired_entry(self, tmp_path):
+        """Test that entries older than the TTL are treated as misses."""
+        cache = PageCache(tmp_path, ttl=60)
+        url = "https://deepwiki.com/rei-2/Amalgam"
+        cache.set(url, "<html></html>")
+        
+        cache_file = next(tmp_path.glob("*.html.gz"))
+        old = time.time() - 120
+        os.utime(cache_file, (old, old))
+        
+        assert cache.get(url) is None
+    
+    def test_etag_revalidation(self, tmp_path):
+        """Test that expired entries keep their ETag and can be refreshed."""
+        cache = PageCache(tmp_path, ttl=60)
+        url = "https://deepwiki.com/rei-2/Amalgam"
+        cache.set(url, "<html></html>", etag='"abc123"')
+        
+        cache_file = next(tmp_path.glob("*.html.gz"))
+        old = time.time() - 120
+        os.utime(cache_file, (old, old))
+        
+        assert cache.get(url) is None
+        assert cache.get_entry(url) == ("<html></html>", '"abc123"')
+        cache.touch(url)
+        assert cache.get(url) == "<html></html>"
\ No newline at end of file